@@ -1,9 +1,17 @@
 """Programa que simula una cola de cajero de manera gráfica usando Pygame."""
 
-import sys, pygame, random, pandas
-import logic, view, params
+import sys, random
+import logic, params
+
+# La ejecución sin ventana no carga pygame ni pandas.
+if __name__ == '__main__' and '--headless' in sys.argv[1:]:
+    import headless
+    sys.exit(headless.main([arg for arg in sys.argv[1:] if arg != '--headless']))
 
 if __name__ == '__main__':
+    import pygame
+    import view, profiling, snapshot, history
+
     pygame.init()
 
     # Declaración de variables de ejecución
@@ -19,57 +27,84 @@ if __name__ == '__main__':
     automatic = False
 
     # Instanciación de la tabla y su representación gráfica.
-    table_data = pandas.DataFrame(columns=('Cliente', 'Estado', 'T. Llegada','Boletas','T. Final'))
+    # Sólo las últimas filas quedan en la tabla; las anteriores se acumulan en los totales del historial.
+    table_data = history.Rolling_History(('Cliente', 'Estado', 'T. Llegada','Boletas','T. Final'))
     table = view.Table(table_data, 100, 10, 100, 20, 1, 7, 2, 'Comic Sans MS', 15)
     queue_tables = []
     
     queue = logic.FIFO_Server_Queue(params.SERVER_CAPACITY)
 
+    # Fila de clientes dibujada, que se actualiza con los cambios que emite la cola.
+    queue_tables.append(view.Line(queue, 10, 250, 430, 90, 'Comic Sans MS', 10))
+
+    # Boletas que faltan por atender de los clientes en la cola.
+    backlog = 0
+
+    # Perfilado opcional de la simulación.
+    profiler = profiling.Profiler(params.ENABLE_PROFILING)
+    if profiler.enabled:
+        profiler.instrument(logic.FIFO_Server_Queue)
+        profiler.instrument(view.Table, ('draw',))
+        profiler.instrument(view.Grant, ('add_line', 'draw'))
+        profiler.instrument(view.Line, ('apply',))
+
 
     
     # Borré lo de las prioridades y las dejé en la clase de Priority_Server_Queue directamente
     def create_new_client(id: str, n_requests: int) -> None:
         """Crea un nuevo cliente para uso del programa."""
 
+        global backlog
         queue_client = logic.Queue_Client(id,n_requests, time)
         queue.enqueue(queue_client)
+        backlog += n_requests
         new_table_line(queue_client)
 
     def new_table_line(queue_client: logic.Queue_Client, arrival_time: int = None) -> None:
         """Crea una nueva línea en la tabla con la información del cliente y el tiempo de llegada indicado."""
-        table_data.loc[len(table_data)] = (
+        table_data.append((
             str(queue_client.get_id()),                         # Id
             'Esperando',                                        # Estado
             time + 1 if arrival_time is None else arrival_time, # Tiempo de llegada
             queue_client.get_number_of_requests(),              # Número de solicitudes.
             None
-        )
+        ), time)
     
-    def expel_table_line(queue_client: logic.Queue_Client) -> pandas.Series:
-        """Devuelve una fila con la infomarción calculada tras la expulsión de un Cliente."""
-
-        # Obtener todas las filas del Cliente.
-        client_rows = table_data[table_data['Cliente'] == queue_client.get_id()].iloc
+    def expel_table_line(queue_client: logic.Queue_Client) -> int:
+        """Marca como expulsada la última fila del Cliente y devuelve su llave en el historial."""
 
-        # Agregar el tiempo final en la última.
-        client_rows[-1, table_data.columns.get_loc('T. Final')] = time + 1
+        # Obtener la última fila del Cliente.
+        client_row = table_data.last_key(str(queue_client.get_id()))
 
-        # Se le resta la ráfaga ejecutada de cada fila del Cliente.
-        for client_row in client_rows:
-            # Sólo se restan los que tienen el mismo tiempo de llegada.
-            if client_row['T. Llegada'] != client_rows[-1]['T. Llegada']:
-                continue
+        # Agregar el tiempo final y cambiar estado a expulsado.
+        table_data.set(client_row, 'T. Final', time + 1)
+        table_data.set(client_row, 'Estado', 'Expulsado')
 
-        # Cambiar estado a expulsado.
-        client_rows[-1, table_data.columns.get_loc('Estado')] = 'Expulsado'
-
-        return client_rows[-1]
+        return client_row
 
     # Clientes iniciales.
     for i in range(5):
         id = chr(ord('A') + i)
         create_new_client(id,random.randint(1,15))
 
+    # Llegadas generadas durante la simulación.
+    workload = None
+    if params.ENABLE_ARRIVALS:
+        import arrivals
+        workload = arrivals.Workload(arrivals.streams(params.ARRIVAL_SEED, 1)[0], start_time=time)
+
+    # Series de tiempo y sus gráficas; NumPy sólo se carga si se piden.
+    sampler = None
+    sparkline_list = []
+    if params.ENABLE_SAMPLER:
+        import sampling
+        sampler = sampling.Series_Sampler(('Longitud', 'Boletas', 'Utilización'))
+        sparkline_list = [
+            view.Sparkline(sampler, 'Longitud', 450, 200, 200, 40, None, 'Blue', 'Comic Sans MS', 10),
+            view.Sparkline(sampler, 'Boletas', 450, 245, 200, 40, None, 'Green', 'Comic Sans MS', 10),
+            view.Sparkline(sampler, 'Utilización', 450, 290, 200, 40, 1, 'Red', 'Comic Sans MS', 10)
+        ]
+
     # Cliente bloqueado actualmente.
     blocked_client: logic.Queue_Client = None
 
@@ -81,6 +116,9 @@ if __name__ == '__main__':
         critical_section_tag
     ]
 
+    # Índice de los elementos que reciben clics y teclas. Cada caja de texto y botón se registra en él.
+    hit_grid = view.HitGrid()
+
     # Instanciación de cajas de texto
     textbox_list = []
 
@@ -91,6 +129,9 @@ if __name__ == '__main__':
     automatic_button.box_color_idle = 'Red'
     button_list.append(automatic_button)
 
+    for widget in textbox_list + button_list:
+        hit_grid.register(widget)
+
     # Acciones de los botones
     def automatic_button_action() -> None:
         """Activa o desactiva el modo automático."""
@@ -107,76 +148,118 @@ if __name__ == '__main__':
 
     automatic_button.action = automatic_button_action
 
+    # Panel con las estadísticas del perfilado.
+    profiler_overlay = view.Overlay(profiler, 10, params.SCREEN_HEIGHT - 150, 'Consolas', 12) if profiler.enabled and params.PROFILING_OVERLAY else None
+
     # Ejecución del programa
     while True:
-        for event in pygame.event.get():
+        with profiler.section('eventos'):
+            events = pygame.event.get()
+
+        for event in events:
             # Oprimir el botón de cerrar ventana.
             if event.type == pygame.QUIT:
+                if profiler.enabled and params.PROFILING_TRACE_PATH:
+                    profiler.export_trace(params.PROFILING_TRACE_PATH)
+                table_data.close()
                 pygame.quit()
                 sys.exit()
 
             # Atención a la cola.
             if event.type == MANUAL_RESPOND or event.type == AUTOMATIC_RESPOND and automatic:
                 time += 1
-                # Sólo si hay clientes en fila.
-                if queue.get_size() > 1:
-                    queue_client = queue.get(1)
-                    queue.dequeue()
-
-                    # Dando tiempo de llegada a Cliente actual.
-                    client_row = table_data[table_data['Cliente'] == str(queue_client.get_id())].iloc[-1]
-                    client_row['Estado'] = 'En Ejecución'
-
-                    # Actulizar la nueva fila en la tabla.
-                    table_data.loc[client_row.name] = client_row
-
-                    # Cuando se terminó de atender a un cliente.
-                    if queue.get_current_service() == 0 and queue.get_size() == 1 or queue.get(1) is not queue_client:
-                        client_row = expel_table_line(queue_client)
-                        if queue_client.is_done():
-                            client_row['Estado'] = 'Terminado'
-                        else:
-                            new_table_line(queue_client, client_row['T. Llegada'])
-                                    
-                        # Actulizar la nueva fila en la tabla.
-                        table_data.loc[client_row.name] = client_row
-
-            # Hacer click en una caja de texto.
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == pygame.BUTTON_LEFT:
-                    for textbox in textbox_list:
-                        textbox.check_active()
-
-            # Escribir en las cajas de texto.
-            if event.type == pygame.KEYDOWN:
-                for textbox in textbox_list:
-                    textbox.add_text(event.unicode)
-
-        # Llenar la pantalla de blanco.
-        screen.fill('White')
-
-        # Actualizando elementos.
-        for button in button_list:
-            button.update()
+                table_data.trim(time)
+                if workload is not None:
+                    for queue_client in workload.feed(queue, time):
+                        backlog += queue_client.get_number_of_requests()
+                        new_table_line(queue_client, queue_client.get_arrival_time())
 
-        # Simulación Semáforo
-        time_tag.tag = f'Tiempo: {time}'
+                # Sólo si hay clientes en fila.
+                served = queue.get_size() > 1
+                if served:
+                    with profiler.section('cola'):
+                        queue_client = queue.get(1)
+                        n_requests = queue_client.get_number_of_requests()
+                        queue.dequeue()
+                        # Un cliente puede llegar sin solicitudes, así que se resta lo que de verdad se atendió.
+                        backlog -= n_requests - queue_client.get_number_of_requests()
+
+                    with profiler.section('tabla'):
+                        # Dando tiempo de llegada a Cliente actual.
+                        client_row = table_data.last_key(str(queue_client.get_id()))
+                        table_data.set(client_row, 'Estado', 'En Ejecución')
+
+                        # Cuando se terminó de atender a un cliente.
+                        if queue.get_current_service() == 0 and queue.get_size() == 1 or queue.get(1) is not queue_client:
+                            client_row = expel_table_line(queue_client)
+                            if queue_client.is_done():
+                                table_data.set(client_row, 'Estado', 'Terminado')
+                                table_data.release(str(queue_client.get_id()))
+                            else:
+                                new_table_line(queue_client, table_data.get(client_row, 'T. Llegada'))
+
+                if sampler is not None:
+                    with profiler.section('muestreo'):
+                        sampler.record(queue.get_size() - 1, backlog, 1 if served else 0)
+
+            # Mover el mouse, hacer click en un botón o caja de texto y escribir en la caja con el foco.
+            hit_grid.handle(event)
 
-        # Dibujando elementos.
-        for tag in tag_list:
-            tag.draw(screen)
+            if event.type == pygame.KEYDOWN:
+                # Guardar o restaurar el estado de la simulación. Las llegadas generadas y las series de tiempo
+                # se guardan con la cola, así que al restaurar siguen desde el mismo punto.
+                if event.key == pygame.K_F5:
+                    snapshot.snapshot(
+                        params.SNAPSHOT_PATH, queue=queue, time=time, table_data=table_data, workload=workload, sampler=sampler
+                    )
+                elif event.key == pygame.K_F9:
+                    try:
+                        state = snapshot.restore(params.SNAPSHOT_PATH)
+                    except OSError:
+                        # Todavía no se ha guardado ninguna foto.
+                        state = None
+
+                    if state is not None:
+                        table_data.close()
+                        queue, time, table_data = state['queue'], state['time'], state['table_data']
+                        workload, sampler = state['workload'], state['sampler']
+                        table.df = table_data
+                        for queue_table in queue_tables:
+                            queue_table.reset(queue)
+                        for sparkline in sparkline_list:
+                            sparkline.reset(sampler)
+                        backlog = sum(queue_client.get_number_of_requests() for queue_client in list(queue)[1:])
+
+        with profiler.section('dibujo'):
+            # Llenar la pantalla de blanco.
+            screen.fill('White')
+
+            # Simulación Semáforo
+            time_tag.tag = f'Tiempo: {time}'
+
+            # Dibujando elementos.
+            for tag in tag_list:
+                tag.draw(screen)
+
+            for textbox in textbox_list:
+                textbox.draw(screen)
+
+            for button in button_list:
+                button.draw(screen)
+            
+            table.draw(screen)
+            
+            for queue_table in queue_tables:
+                queue_table.draw(screen)
 
-        for textbox in textbox_list:
-            textbox.draw(screen)
+            for sparkline in sparkline_list:
+                sparkline.draw(screen)
 
-        for button in button_list:
-            button.draw(screen)
-        
-        table.draw(screen)
-        
-        for queue_table in queue_tables:
-            queue_table.draw(screen)
+            if profiler_overlay is not None:
+                profiler_overlay.draw(screen)
             
         # Actualizar pantalla y esperar.
-        pygame.display.update()
+        with profiler.section('pantalla'):
+            pygame.display.update()
+
         clock.tick()
@@ -0,0 +1,297 @@
+"""Módulo con modelos analíticos de colas para estimar al instante la espera y la longitud de la cola de cajero,
+y con funciones para validarlos contra simulaciones sin ventana.
+
+Cada solicitud tarda un tiempo en atenderse, así que el tiempo de servicio de un cliente es su número de solicitudes.
+Con capacidad 0 el cajero atiende a cada cliente hasta terminar (FIFO); con otra capacidad atiende una solicitud,
+o quantum solicitudes, y lo manda al final de la cola (turno circular), que se aproxima como procesador compartido."""
+
+import math
+import logic, params
+
+class Prediction:
+    """Resultado de un modelo: utilización, espera en la cola, tiempo en el sistema y número promedio de clientes."""
+
+    def __init__(self, model: str, rate: float, mean_service: float, rho: float, wait: float, servers: int = 1) -> None:
+        """model: Nombre del modelo.
+        rate: Tasa de llegadas.
+        mean_service: Tiempo de servicio promedio.
+        rho: Utilización de cada cajero.
+        wait: Espera promedio en la cola antes de terminar, sin contar el servicio."""
+
+        self.model = model
+        self.rate = rate
+        self.mean_service = mean_service
+        self.rho = rho
+        self.servers = servers
+        self.wait = wait
+        self.response = wait + mean_service
+        self.queue_length = rate * wait
+        self.in_system = rate * self.response
+
+    def is_stable(self) -> bool:
+        """Verdadero si la cola no crece sin límite."""
+
+        return self.rho < 1
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.model}, rho={self.rho:.3f}, espera={self.wait:.3f}, cola={self.queue_length:.3f})'
+
+def distribution(requests) -> list[tuple[float, float]]:
+    """Devuelve la distribución del número de solicitudes como parejas (valor, probabilidad).
+    requests: arrivals.Uniform_Requests, arrivals.Empirical_Requests, un diccionario {valor: probabilidad} o un número fijo.
+    Por defecto, uniforme entre 1 y 15, como los clientes de la simulación."""
+
+    if requests is None:
+        return [(n, 1 / 15) for n in range(1, 16)]
+
+    if isinstance(requests, (int, float)):
+        return [(requests, 1.0)]
+
+    if isinstance(requests, dict):
+        pairs = list(requests.items())
+    elif hasattr(requests, 'low') and hasattr(requests, 'high'):
+        pairs = [(n, 1.0) for n in range(requests.low, requests.high + 1)]
+    elif hasattr(requests, 'values') and hasattr(requests, 'probabilities'):
+        pairs = list(zip(requests.values.tolist(), requests.probabilities.tolist()))
+    else:
+        raise ValueError
+
+    total = sum(p for _, p in pairs)
+    if total <= 0:
+        raise ValueError
+
+    return [(value, p / total) for value, p in pairs]
+
+def moments(requests) -> tuple[float, float]:
+    """Devuelve el primer y segundo momento del tiempo de servicio de un cliente, E[S] y E[S²]."""
+
+    pairs = distribution(requests)
+    return sum(value * p for value, p in pairs), sum(value * value * p for value, p in pairs)
+
+def mm1(rate: float, mean_service: float) -> Prediction:
+    """M/M/1: llegadas de Poisson y servicio exponencial con un cajero."""
+
+    rho = rate * mean_service
+    wait = rho * mean_service / (1 - rho) if rho < 1 else math.inf
+    return Prediction('M/M/1', rate, mean_service, rho, wait)
+
+def mg1(rate: float, mean_service: float, second_moment: float) -> Prediction:
+    """M/G/1 con la fórmula de Pollaczek–Khinchine: llegadas de Poisson y servicio con cualquier distribución, atendido en orden."""
+
+    rho = rate * mean_service
+    wait = rate * second_moment / (2 * (1 - rho)) if rho < 1 else math.inf
+    return Prediction('M/G/1', rate, mean_service, rho, wait)
+
+def mg1_ps(rate: float, mean_service: float) -> Prediction:
+    """M/G/1 con procesador compartido, aproximación del turno circular con quantum pequeño.
+    El tiempo promedio en el sistema, E[S] / (1 - rho), no depende de la distribución del servicio."""
+
+    rho = rate * mean_service
+    wait = rho * mean_service / (1 - rho) if rho < 1 else math.inf
+    return Prediction('M/G/1-PS', rate, mean_service, rho, wait)
+
+def erlang_c(offered: float, servers: int) -> float:
+    """Devuelve la probabilidad de que un cliente tenga que esperar en una M/M/c.
+    offered: Carga ofrecida, tasa de llegadas por tiempo de servicio promedio.
+    servers: Número de cajeros."""
+
+    if servers < 1:
+        raise ValueError
+
+    if offered >= servers:
+        return 1.0
+
+    # Suma de a^k / k! para k < c, calculada término a término para no desbordar.
+    term = 1.0
+    total = 0.0
+    for k in range(servers):
+        total += term
+        term *= offered / (k + 1)
+
+    last = term * servers / (servers - offered)
+    return last / (total + last)
+
+def mmc(rate: float, mean_service: float, servers: int) -> Prediction:
+    """M/M/c con la fórmula de Erlang C: llegadas de Poisson, servicio exponencial y varios cajeros con una sola fila."""
+
+    offered = rate * mean_service
+    rho = offered / servers
+    wait = erlang_c(offered, servers) * mean_service / (servers - offered) if rho < 1 else math.inf
+    return Prediction('M/M/c', rate, mean_service, rho, wait, servers)
+
+def models(rate: float = None, requests=None, servers: int = 1) -> dict[str, Prediction]:
+    """Devuelve las predicciones de todos los modelos, por nombre, para compararlas.
+    rate: Tasa de llegadas. Por defecto, params.ARRIVAL_RATE.
+    requests: Distribución del número de solicitudes, como en distribution.
+    servers: Número de cajeros."""
+
+    rate = params.ARRIVAL_RATE if rate is None else rate
+    mean, second = moments(requests)
+    out = {
+        'M/M/1': mm1(rate / servers, mean),
+        'M/G/1': mg1(rate / servers, mean, second),
+        'M/G/1-PS': mg1_ps(rate / servers, mean)
+    }
+    if servers > 1:
+        out['M/M/c'] = mmc(rate, mean, servers)
+
+    return out
+
+def predict(rate: float = None, requests=None, capacity: int = None, servers: int = 1, quantum: int = None) -> Prediction:
+    """Devuelve la predicción del modelo que corresponde a la configuración del cajero.
+    rate: Tasa de llegadas. Por defecto, params.ARRIVAL_RATE.
+    requests: Distribución del número de solicitudes, como en distribution.
+    capacity: Capacidad del cajero. Por defecto, params.SERVER_CAPACITY.
+    servers: Número de cajeros. Con más de uno se usa M/M/c, que supone servicio exponencial.
+    quantum: Número de solicitudes por turno. Con capacidad distinta de 0, el turno circular se aproxima como procesador compartido."""
+
+    rate = params.ARRIVAL_RATE if rate is None else rate
+    capacity = params.SERVER_CAPACITY if capacity is None else capacity
+    mean, second = moments(requests)
+
+    if servers > 1:
+        return mmc(rate, mean, servers)
+
+    if capacity == 0 and quantum is None:
+        return mg1(rate, mean, second)
+
+    return mg1_ps(rate, mean)
+
+class Wait_Tracker:
+    """Mide en una ejecución de headless.run el tiempo en el sistema y la espera de los clientes que terminan,
+    y el promedio en el tiempo de los clientes que esperan en la fila, sin contar al que está siendo atendido.
+    La longitud de la fila se mide desde la llegada del primer cliente medido hasta la salida del último."""
+
+    def __init__(self, measured: set[logic.Queue_Client] = None) -> None:
+        """measured: Clientes a medir. Por defecto, todos."""
+
+        self.measured = measured
+        self.arrivals: dict[logic.Queue_Client, tuple[int, int]] = {}
+        self.responses = 0
+        self.waits = 0
+        self.done = 0
+
+        # Clientes en el sistema y área bajo la longitud de la fila durante la ventana medida.
+        self.in_system = 0
+        self.queue_area = 0
+        self.window_start = None
+        self.window_end = None
+        self.__remaining = None if measured is None else len(measured)
+        self.__last = 0
+
+    def __advance(self, time: int) -> None:
+        """Acumula la longitud de la fila hasta el tiempo indicado."""
+
+        if self.window_start is not None and self.__remaining != 0:
+            self.queue_area += max(self.in_system - 1, 0) * (time - self.__last)
+            self.window_end = time
+
+        self.__last = time
+
+    def arrive(self, time: int, client: logic.Queue_Client) -> None:
+        """Registra la llegada de un cliente a la cola."""
+
+        self.__advance(time)
+        self.in_system += 1
+
+        if self.measured is not None and client not in self.measured:
+            return
+
+        if self.window_start is None:
+            self.window_start = time
+        self.arrivals[client] = (client.get_arrival_time(), client.get_number_of_requests())
+
+    def serve(self, time: int, client: logic.Queue_Client) -> None:
+        """Registra que el cliente fue atendido durante [time, time + 1) y, si terminó, su tiempo de respuesta."""
+
+        if not client.is_done():
+            return
+
+        # El cliente sale al terminar el tiempo en que fue atendido.
+        self.__advance(time + 1)
+        self.in_system -= 1
+
+        if client in self.arrivals:
+            arrival_time, n_requests = self.arrivals.pop(client)
+            response = time + 1 - arrival_time
+            self.responses += response
+            self.waits += response - n_requests
+            self.done += 1
+            if self.__remaining is not None:
+                self.__remaining -= 1
+
+    def queue_length(self) -> float:
+        """Devuelve el promedio en el tiempo de los clientes en espera durante la ventana medida."""
+
+        if self.window_start is None or self.window_end == self.window_start:
+            return math.nan
+
+        return self.queue_area / (self.window_end - self.window_start)
+
+def validate(rate: float = None, requests=None, capacity: int = None, n_clients: int = 100_000, seed: int = None, warmup: float = 0.1) -> dict:
+    """Simula sin ventana una FIFO_Server_Queue con llegadas de Poisson y compara el resultado con predict.
+    Devuelve la predicción, la espera y la longitud de cola medidas y el error relativo de cada una.
+    rate: Tasa de llegadas. Por defecto, params.ARRIVAL_RATE.
+    requests: Distribución del número de solicitudes, como arrivals.Uniform_Requests o arrivals.Empirical_Requests.
+    capacity: Capacidad del cajero. Por defecto, params.SERVER_CAPACITY.
+    n_clients: Número de clientes simulados.
+    seed: Semilla aleatoria. Por defecto, params.ARRIVAL_SEED.
+    warmup: Fracción de los primeros clientes que no se mide, para no contar la cola vacía del inicio."""
+
+    # NumPy y el simulador sólo se cargan al validar.
+    import arrivals, headless
+
+    rate = params.ARRIVAL_RATE if rate is None else rate
+    capacity = params.SERVER_CAPACITY if capacity is None else capacity
+    seed = params.ARRIVAL_SEED if seed is None else seed
+    requests = arrivals.Uniform_Requests() if requests is None else requests
+
+    prediction = predict(rate, requests, capacity)
+    workload = arrivals.Workload(arrivals.streams(seed, 1)[0], arrivals.Poisson_Arrivals(rate), requests)
+    clients = list(workload.clients(n_clients))
+
+    # Los clientes del calentamiento se simulan pero no se miden.
+    skipped = int(n_clients * warmup)
+    tracker = Wait_Tracker(set(clients[skipped:]))
+    headless.run(logic.FIFO_Server_Queue(capacity), clients, tracker)
+
+    wait = tracker.waits / tracker.done if tracker.done else math.nan
+    queue_length = tracker.queue_length()
+
+    def error(predicted: float, observed: float) -> float:
+        return abs(predicted - observed) / observed if observed else math.inf
+
+    return {
+        'prediction': prediction,
+        'wait': wait,
+        'response': tracker.responses / tracker.done if tracker.done else math.nan,
+        'queue_length': queue_length,
+        'wait_error': error(prediction.wait, wait),
+        'queue_length_error': error(prediction.queue_length, queue_length)
+    }
+
+def sweep(rates: list[float], requests=None, capacity: int = None, tolerance: float = None, max_rho: float = None, **kwargs) -> list[dict]:
+    """Estima la espera para varias tasas de llegada, como en una planeación de capacidad.
+    Se usa la fórmula donde la utilización es baja y se simula sólo donde no se puede confiar en ella:
+    con utilización de al menos max_rho, o si la simulación de la tasa anterior mostró un error mayor a tolerance.
+    rates: Tasas de llegada, de menor a mayor.
+    tolerance: Error relativo aceptable. Por defecto, params.ANALYTICS_TOLERANCE.
+    max_rho: Utilización desde la cual se simula. Por defecto, params.ANALYTICS_MAX_RHO.
+    kwargs: Argumentos para validate."""
+
+    tolerance = params.ANALYTICS_TOLERANCE if tolerance is None else tolerance
+    max_rho = params.ANALYTICS_MAX_RHO if max_rho is None else max_rho
+
+    out = []
+    trusted = True
+    for rate in rates:
+        prediction = predict(rate, requests, capacity)
+        if trusted and prediction.rho < max_rho:
+            out.append({'rate': rate, 'source': 'modelo', 'wait': prediction.wait, 'queue_length': prediction.queue_length, 'prediction': prediction})
+            continue
+
+        result = validate(rate, requests, capacity, **kwargs)
+        trusted = result['wait_error'] <= tolerance
+        out.append({'rate': rate, 'source': 'simulación', 'wait': result['wait'], 'queue_length': result['queue_length'], 'prediction': prediction})
+
+    return out
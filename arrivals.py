@@ -0,0 +1,229 @@
+"""Módulo para generar llegadas de clientes por lotes con NumPy para la simulación de una cola de cajero."""
+
+import numpy
+from typing import Iterator
+import logic, params
+
+def streams(seed: int, n: int) -> list[numpy.random.Generator]:
+    """Devuelve generadores aleatorios independientes, uno por réplica, derivados de una sola semilla.
+    seed: Semilla de la simulación.
+    n: Número de réplicas."""
+
+    return [numpy.random.Generator(numpy.random.PCG64(child)) for child in numpy.random.SeedSequence(seed).spawn(n)]
+
+class Poisson_Arrivals:
+    """Llegadas de Poisson: los tiempos entre llegadas siguen una distribución exponencial."""
+
+    def __init__(self, rate: float) -> None:
+        """rate: Número promedio de llegadas por unidad de tiempo."""
+
+        if rate <= 0:
+            raise ValueError
+
+        self.rate = rate
+
+    def sample(self, rng: numpy.random.Generator, size: int, start: float) -> numpy.ndarray:
+        """Devuelve los tiempos de las siguientes llegadas, en orden.
+        rng: Generador aleatorio.
+        size: Número de llegadas.
+        start: Tiempo de la última llegada."""
+
+        return start + numpy.cumsum(rng.exponential(1 / self.rate, size))
+
+class MMPP_Arrivals:
+    """Llegadas de Poisson moduladas por una cadena de Markov: la tasa cambia según un estado oculto
+    que pasa al siguiente estado, en orden circular, tras un tiempo exponencial. Sirve para modelar ráfagas."""
+
+    def __init__(self, rates: tuple[float, ...], mean_sojourns: tuple[float, ...]) -> None:
+        """rates: Tasa de llegadas en cada estado.
+        mean_sojourns: Tiempo promedio que se permanece en cada estado."""
+
+        if len(rates) != len(mean_sojourns) or not rates or min(rates) < 0 or max(rates) == 0 or min(mean_sojourns) <= 0:
+            raise ValueError
+
+        self.rates = numpy.asarray(rates, dtype=float)
+        self.mean_sojourns = numpy.asarray(mean_sojourns, dtype=float)
+        self.state = 0
+        self.state_start = 0.0
+        self.pending = numpy.empty(0)
+
+    def sample(self, rng: numpy.random.Generator, size: int, start: float) -> numpy.ndarray:
+        """Devuelve los tiempos de las siguientes llegadas, en orden.
+        rng: Generador aleatorio.
+        size: Número de llegadas.
+        start: Tiempo de la última llegada. Se ignora porque el proceso lleva su propio reloj."""
+
+        n_states = len(self.rates)
+        chunks = [self.pending]
+        total = len(self.pending)
+
+        # Se generan bloques de estadías hasta tener suficientes llegadas; lo que sobra queda para el siguiente lote.
+        expected_per_cycle = max(float(numpy.sum(self.rates * self.mean_sojourns)), 1.0)
+        while total < size:
+            n_sojourns = n_states * max(1, int(numpy.ceil((size - total) / expected_per_cycle)))
+            states = (self.state + numpy.arange(n_sojourns)) % n_states
+            durations = rng.exponential(self.mean_sojourns[states])
+            starts = self.state_start + numpy.concatenate(([0.0], numpy.cumsum(durations[:-1])))
+
+            counts = rng.poisson(self.rates[states] * durations)
+            segment = numpy.repeat(numpy.arange(n_sojourns), counts)
+            times = numpy.sort(starts[segment] + rng.random(len(segment)) * durations[segment])
+
+            chunks.append(times)
+            total += len(times)
+            self.state = int((self.state + n_sojourns) % n_states)
+            self.state_start = float(starts[-1] + durations[-1])
+
+        times = numpy.concatenate(chunks)
+        self.pending = times[size:]
+        return times[:size]
+
+class On_Off_Arrivals(MMPP_Arrivals):
+    """Fuente encendida y apagada: llegadas de Poisson mientras está encendida y ninguna mientras está apagada."""
+
+    def __init__(self, rate: float, mean_on: float, mean_off: float) -> None:
+        """rate: Tasa de llegadas mientras está encendida.
+        mean_on: Tiempo promedio encendida.
+        mean_off: Tiempo promedio apagada."""
+
+        super().__init__((rate, 0.0), (mean_on, mean_off))
+
+class Uniform_Requests:
+    """Número de solicitudes uniforme entre dos valores, incluidos."""
+
+    def __init__(self, low: int = 1, high: int = 15) -> None:
+        """low: Mínimo número de solicitudes.
+        high: Máximo número de solicitudes."""
+
+        if not 0 <= low <= high:
+            raise ValueError
+
+        self.low = low
+        self.high = high
+
+    def sample(self, rng: numpy.random.Generator, size: int) -> numpy.ndarray:
+        """Devuelve el número de solicitudes de los siguientes clientes.
+        rng: Generador aleatorio.
+        size: Número de clientes."""
+
+        return rng.integers(self.low, self.high, size, endpoint=True)
+
+class Empirical_Requests:
+    """Número de solicitudes según una distribución empírica tomada de una traza real."""
+
+    def __init__(self, values: numpy.ndarray, probabilities: numpy.ndarray) -> None:
+        """values: Números de solicitudes posibles.
+        probabilities: Probabilidad de cada número de solicitudes."""
+
+        values = numpy.asarray(values)
+        probabilities = numpy.asarray(probabilities, dtype=float)
+        if len(values) == 0 or len(values) != len(probabilities) or values.min() < 0:
+            raise ValueError
+
+        self.values = values
+        self.probabilities = probabilities / probabilities.sum()
+
+    @classmethod
+    def fit(cls, trace) -> 'Empirical_Requests':
+        """Construye la distribución con las frecuencias observadas en una traza.
+        trace: Números de solicitudes observados."""
+
+        values, counts = numpy.unique(numpy.asarray(trace, dtype=numpy.int64), return_counts=True)
+        return cls(values, counts)
+
+    def sample(self, rng: numpy.random.Generator, size: int) -> numpy.ndarray:
+        """Devuelve el número de solicitudes de los siguientes clientes.
+        rng: Generador aleatorio.
+        size: Número de clientes."""
+
+        return rng.choice(self.values, size, p=self.probabilities)
+
+class Workload:
+    """Genera clientes por lotes en orden de llegada y los entrega a la cola sólo cuando llega su tiempo."""
+
+    def __init__(self, rng: numpy.random.Generator, arrivals=None, requests=None, batch_size: int = None, start_time: int = 0, prefix: str = '') -> None:
+        """rng: Generador aleatorio de esta réplica, por ejemplo uno de los devueltos por streams.
+        arrivals: Proceso de llegadas. Por defecto, Poisson con tasa params.ARRIVAL_RATE.
+        requests: Distribución del número de solicitudes. Por defecto, uniforme entre 1 y 15.
+        batch_size: Número de clientes por lote. Por defecto, params.ARRIVAL_BATCH_SIZE.
+        start_time: Tiempo desde el que se generan llegadas.
+        prefix: Prefijo para los ids de los clientes."""
+
+        self.rng = rng
+        self.arrivals = Poisson_Arrivals(params.ARRIVAL_RATE) if arrivals is None else arrivals
+        self.requests = Uniform_Requests() if requests is None else requests
+        self.batch_size = params.ARRIVAL_BATCH_SIZE if batch_size is None else batch_size
+        self.prefix = prefix
+
+        self.__last_arrival = float(start_time)
+        self.__generated = 0
+        self.__times = numpy.empty(0, dtype=numpy.int64)
+        self.__n_requests = numpy.empty(0, dtype=numpy.int64)
+        self.__pos = 0
+
+    def batch(self, size: int = None) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Devuelve los tiempos de llegada, redondeados hacia abajo al tiempo de la simulación, y el número de solicitudes
+        de los siguientes clientes, como arreglos.
+        size: Número de clientes. Por defecto, batch_size."""
+
+        size = self.batch_size if size is None else size
+        times = self.arrivals.sample(self.rng, size, self.__last_arrival)
+        if len(times):
+            self.__last_arrival = float(times[-1])
+
+        return numpy.floor(times).astype(numpy.int64), self.requests.sample(self.rng, size).astype(numpy.int64)
+
+    def __refill(self) -> None:
+        """Genera el siguiente lote cuando se entregaron todos los clientes del actual."""
+
+        self.__times, self.__n_requests = self.batch()
+        self.__pos = 0
+
+    def peek_time(self) -> int:
+        """Devuelve el tiempo de llegada del siguiente cliente."""
+
+        if self.__pos >= len(self.__times):
+            self.__refill()
+
+        return int(self.__times[self.__pos])
+
+    def due(self, time: int) -> list[logic.Queue_Client]:
+        """Devuelve los clientes que llegan hasta el tiempo indicado, incluido, y que no se habían entregado.
+        time: Tiempo actual de la simulación."""
+
+        out = []
+        while self.peek_time() <= time:
+            # Todos los clientes del lote que ya llegaron se encuentran con una búsqueda binaria.
+            end = int(numpy.searchsorted(self.__times, time, side='right'))
+            for arrival_time, n_requests in zip(self.__times[self.__pos:end].tolist(), self.__n_requests[self.__pos:end].tolist()):
+                out.append(logic.Queue_Client(f'{self.prefix}{self.__generated}', n_requests, arrival_time))
+                self.__generated += 1
+
+            self.__pos = end
+
+        return out
+
+    def clients(self, limit: int = None) -> Iterator[logic.Queue_Client]:
+        """Devuelve un iterador de clientes en orden de llegada, generados por lotes a medida que se piden.
+        limit: Número máximo de clientes. Si es None, el iterador no termina."""
+
+        while limit is None or self.__generated < limit:
+            if self.__pos >= len(self.__times):
+                self.__refill()
+
+            end = len(self.__times) if limit is None else min(len(self.__times), self.__pos + limit - self.__generated)
+            for arrival_time, n_requests in zip(self.__times[self.__pos:end].tolist(), self.__n_requests[self.__pos:end].tolist()):
+                yield logic.Queue_Client(f'{self.prefix}{self.__generated}', n_requests, arrival_time)
+                self.__generated += 1
+                self.__pos += 1
+
+    def feed(self, queue: logic.FIFO_Server_Queue, time: int) -> list[logic.Queue_Client]:
+        """Agrega a la cola los clientes que llegan hasta el tiempo indicado y los devuelve.
+        queue: Cola a la que llegan los clientes.
+        time: Tiempo actual de la simulación."""
+
+        clients = self.due(time)
+        for client in clients:
+            queue.enqueue(client)
+
+        return clients
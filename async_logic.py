@@ -0,0 +1,125 @@
+"""Módulo con una envoltura asíncrona de la cola de cajero para usarla con asyncio."""
+
+import asyncio
+from typing import AsyncIterator
+import logic, params
+
+class Async_Server_Queue:
+    """Envuelve una cola de cajero para que varios productores asíncronos le agreguen clientes
+    y un servidor asíncrono la atienda a una tasa fija."""
+
+    def __init__(self, queue: logic.FIFO_Server_Queue = None, max_length: int = None, rate: float = None) -> None:
+        """queue: Cola a envolver. Por defecto, una cola nueva con la capacidad de params.SERVER_CAPACITY.
+        max_length: Número máximo de clientes esperando. Si se alcanza, enqueue espera a que haya espacio.
+                    Si es None, no hay límite.
+        rate: Número de atenciones por segundo. Por defecto, según params.AUTOMATIC_RESPOND_TIME."""
+
+        if max_length is not None and max_length <= 0:
+            raise ValueError
+
+        if rate is not None and rate <= 0:
+            raise ValueError
+
+        self.queue = logic.FIFO_Server_Queue(params.SERVER_CAPACITY) if queue is None else queue
+        self.max_length = max_length
+        self.rate = 1000 / params.AUTOMATIC_RESPOND_TIME if rate is None else rate
+        self.time = 0
+
+        self.__not_full = asyncio.Condition()
+        self.__not_empty = asyncio.Condition()
+        self.__subscribers: list[asyncio.Queue] = []
+        self.__closed = False
+
+    def get_length(self) -> int:
+        """Devuelve el número de clientes esperando en la cola, sin contar al cajero."""
+
+        return self.queue.get_size() - 1
+
+    def is_full(self) -> bool:
+        """Verdadero si la cola alcanzó su longitud máxima. Falso de lo contrario."""
+
+        return self.max_length is not None and self.get_length() >= self.max_length
+
+    async def enqueue(self, client: logic.Queue_Client) -> None:
+        """Agrega un cliente al final de la cola, esperando si está llena.
+        client: Cliente a agregar a la cola."""
+
+        if self.__closed:
+            raise RuntimeError('La cola está cerrada.')
+
+        async with self.__not_full:
+            await self.__not_full.wait_for(lambda: self.__closed or not self.is_full())
+
+            if self.__closed:
+                raise RuntimeError('La cola está cerrada.')
+
+            self.queue.enqueue(client)
+
+        async with self.__not_empty:
+            self.__not_empty.notify()
+
+    def completions(self) -> AsyncIterator[tuple[int, logic.Queue_Client]]:
+        """Devuelve un iterador asíncrono de los clientes que terminan a partir de este momento,
+        como parejas (tiempo, cliente). Termina cuando la cola se cierra y se vacía."""
+
+        events = asyncio.Queue()
+        self.__subscribers.append(events)
+        return self.__iterate(events)
+
+    async def __iterate(self, events: asyncio.Queue) -> AsyncIterator[tuple[int, logic.Queue_Client]]:
+        """Entrega los eventos de la cola indicada hasta recibir el fin."""
+
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    return
+
+                yield event
+        finally:
+            self.__subscribers.remove(events)
+
+    def __publish(self, event) -> None:
+        """Envía un evento a todos los iteradores de terminación."""
+
+        for events in self.__subscribers:
+            events.put_nowait(event)
+
+    async def serve(self) -> None:
+        """Atiende la cola a la tasa indicada hasta que se cierre y no queden clientes."""
+
+        period = 1 / self.rate
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
+        while True:
+            async with self.__not_empty:
+                await self.__not_empty.wait_for(lambda: self.__closed or self.get_length() > 0)
+
+            if self.get_length() == 0:
+                break
+
+            self.time += 1
+            queue_client = self.queue.dequeue()
+
+            if queue_client is not None:
+                self.__publish((self.time, queue_client))
+                async with self.__not_full:
+                    self.__not_full.notify()
+
+            # Se programa contra un reloj absoluto para que la tasa no se desvíe.
+            next_tick = max(next_tick + period, loop.time())
+            await asyncio.sleep(next_tick - loop.time())
+
+        self.__publish(None)
+
+    async def close(self) -> None:
+        """Cierra la cola. Los productores en espera reciben un error y el servidor termina al vaciarla."""
+
+        self.__closed = True
+
+        async with self.__not_full:
+            self.__not_full.notify_all()
+
+        async with self.__not_empty:
+            self.__not_empty.notify_all()
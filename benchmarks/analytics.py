@@ -0,0 +1,32 @@
+"""Compara los modelos analíticos con simulaciones sin ventana pequeñas y falla si la validación no funciona."""
+
+import math, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+
+def main(n_clients: int = 20_000) -> int:
+    failed = False
+    for capacity in (0, 1):
+        for rate in (0.05, 0.08):
+            result = analytics.validate(rate, capacity=capacity, n_clients=n_clients, seed=1)
+            prediction = result['prediction']
+            print(
+                f'capacidad={capacity} tasa={rate}: {prediction.model} espera={prediction.wait:.2f} cola={prediction.queue_length:.2f}'
+                f' | simulación espera={result["wait"]:.2f} cola={result["queue_length"]:.2f}'
+                f' | error espera={result["wait_error"]:.1%} cola={result["queue_length_error"]:.1%}'
+            )
+
+            if not all(math.isfinite(result[name]) for name in ('wait', 'queue_length', 'wait_error', 'queue_length_error')):
+                failed = True
+
+    sweep = analytics.sweep([0.05, 0.06], capacity=0, max_rho=0.3, n_clients=n_clients // 4, seed=1)
+    print('barrido:', ', '.join(f'{row["rate"]}: {row["source"]}' for row in sweep))
+    if [row['source'] for row in sweep] != ['simulación', 'simulación']:
+        failed = True
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+"""Guarda y restaura fotos de colas de todos los tipos, revisa que los objetos repetidos sigan siendo el mismo y mide el tiempo con una fila larga."""
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic, params, snapshot
+
+def round_trip() -> bool:
+    """Devuelve verdadero si una foto con colas repetidas, anidadas y clientes compartidos se restaura con las mismas relaciones."""
+
+    classes = list(params.WFQ_WEIGHTS)
+    clients = [logic.Queue_Client(str(i), 3, i, classes[i % len(classes)], 50 + i) for i in range(12)]
+
+    mlfq = logic.MLFQ_Server_Queue(None, None, *clients[:3])
+    wfq = logic.WFQ_Server_Queue(None, *clients[3:6])
+    edf = logic.EDF_Server_Queue(True, 0, *clients[6:9])
+    fifo = logic.FIFO_Server_Queue(params.SERVER_CAPACITY, None, clients[0], *clients[9:])
+    for queue in (mlfq, wfq, edf, fifo):
+        queue.dequeue()
+
+    level = mlfq._MLFQ_Server_Queue__levels[0]
+    state = snapshot.Snapshot.capture(a=mlfq, b=mlfq, c=wfq, d=wfq, e=edf, f=edf, g=fifo, h=[fifo, level], i=clients[0]).restore()
+
+    ok = state['a'] is state['b'] and state['c'] is state['d'] and state['e'] is state['f'] and state['h'][0] is state['g']
+    ok = ok and state['h'][1] is state['a']._MLFQ_Server_Queue__levels[0] and state['g'].get(1) is state['i']
+    for name, queue in (('a', mlfq), ('c', wfq), ('e', edf), ('g', fifo)):
+        restored = state[name]
+        ok = ok and type(restored) is type(queue) and [str(item) for item in restored] == [str(item) for item in queue]
+        ok = ok and restored.get_current_service() == queue.get_current_service()
+
+    return ok
+
+def main(n_clients: int = 1_000_000) -> int:
+    ok = round_trip()
+    print('ida y vuelta:', 'bien' if ok else 'mal')
+
+    queue = logic.FIFO_Server_Queue(params.SERVER_CAPACITY)
+    for i in range(n_clients):
+        queue.enqueue(logic.Queue_Client(str(i), 1 + i % 15, i // 10))
+
+    start = time.perf_counter()
+    photo = snapshot.Snapshot.capture(queue=queue, time=0)
+    middle = time.perf_counter()
+    restored = photo.restore()['queue']
+    end = time.perf_counter()
+    print(f'{n_clients} clientes: captura {middle - start:.3f} s, restauración {end - middle:.3f} s, {len(photo.data) / 1e6:.1f} MB')
+
+    ok = ok and restored.get_size() == queue.get_size()
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
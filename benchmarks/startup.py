@@ -0,0 +1,54 @@
+"""Mide el tiempo de arranque de la ejecución sin ventana con python -X importtime."""
+
+import os, subprocess, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pygame', 'pandas', 'numpy')
+
+def import_times(module: str) -> list[tuple[str, int, int]]:
+    """Importa el módulo indicado en un proceso nuevo y devuelve (módulo, tiempo propio, tiempo acumulado) en microsegundos.
+    module: Nombre del módulo a importar."""
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        times.append((name.strip(), int(self_time), int(cumulative)))
+
+    return times
+
+def run_time(args: list[str], repeat: int = 5) -> float:
+    """Devuelve el menor tiempo, en segundos, de varias ejecuciones del programa con los argumentos indicados."""
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, ROOT] + args, cwd=ROOT, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+def main() -> int:
+    failed = False
+    for module in ('logic', 'headless'):
+        times = import_times(module)
+        total = next(cumulative for name, _, cumulative in times if name == module)
+        heavy = [name for name, _, _ in times if name.split('.')[0] in HEAVY_MODULES]
+        print(f'import {module}: {total / 1000:.1f} ms')
+
+        if heavy:
+            print(f'  importa módulos pesados: {", ".join(sorted(set(name.split(".")[0] for name in heavy)))}')
+            failed = True
+
+    print(f'python . --headless: {run_time(["--headless"]) * 1000:.1f} ms')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
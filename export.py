@@ -0,0 +1,152 @@
+"""Módulo para guardar los resultados de la simulación de una cola de cajero en formato Parquet o Arrow IPC.
+Los registros se escriben por grupos de filas mientras la simulación avanza, así que la memoria usada no crece con la ejecución."""
+
+import logic, params
+
+class Results_Writer:
+    """Escribe registros de clientes terminados en un archivo Parquet o Arrow IPC, por grupos de filas."""
+
+    COLUMNS = ('cliente', 'estado', 't_llegada', 'boletas', 't_final', 'intervalos')
+
+    def __init__(self, path: str, file_format: str = None, row_group_size: int = None) -> None:
+        """path: Ruta del archivo.
+        file_format: 'parquet' o 'arrow'. Por defecto, según la extensión del archivo.
+        row_group_size: Número de filas por grupo. Por defecto, params.EXPORT_ROW_GROUP_SIZE."""
+
+        # pyarrow sólo se carga cuando se exporta.
+        import pyarrow
+
+        if file_format is None:
+            file_format = 'parquet' if path.endswith('.parquet') else 'arrow'
+
+        if file_format not in ('parquet', 'arrow'):
+            raise ValueError
+
+        self.pa = pyarrow
+        self.row_group_size = params.EXPORT_ROW_GROUP_SIZE if row_group_size is None else row_group_size
+        self.rows = 0
+
+        self.interval_type = pyarrow.struct([('inicio', pyarrow.int64()), ('fin', pyarrow.int64())])
+        self.schema = pyarrow.schema([
+            ('cliente', pyarrow.string()),
+            ('estado', pyarrow.string()),
+            ('t_llegada', pyarrow.int64()),
+            ('boletas', pyarrow.int64()),
+            ('t_final', pyarrow.int64()),
+            ('intervalos', pyarrow.list_(self.interval_type))
+        ])
+
+        if file_format == 'parquet':
+            import pyarrow.parquet
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            import pyarrow.ipc
+            self.writer = pyarrow.ipc.new_file(path, self.schema)
+
+        self.__clear()
+
+    def __clear(self) -> None:
+        """Vacía el lote pendiente."""
+
+        self.__columns = {name: [] for name in Results_Writer.COLUMNS[:-1]}
+
+        # Los intervalos se guardan planos, con desplazamientos, para construir la lista sin objetos intermedios.
+        self.__offsets = [0]
+        self.__starts = []
+        self.__ends = []
+
+    def write(self, id_client: str, state: str, arrival_time: int, tickets: int, final_time: int, intervals: list[tuple[int, int]]) -> None:
+        """Agrega un registro y escribe un grupo de filas si el lote está lleno.
+        id_client: Id del cliente.
+        state: Estado final del cliente.
+        arrival_time: Tiempo de llegada.
+        tickets: Número de boletas pedidas.
+        final_time: Tiempo en el que terminó.
+        intervals: Intervalos [inicio, fin) en los que fue atendido."""
+
+        columns = self.__columns
+        columns['cliente'].append(str(id_client))
+        columns['estado'].append(state)
+        columns['t_llegada'].append(arrival_time)
+        columns['boletas'].append(tickets)
+        columns['t_final'].append(final_time)
+
+        for start, end in intervals:
+            self.__starts.append(start)
+            self.__ends.append(end)
+        self.__offsets.append(len(self.__starts))
+
+        if len(columns['cliente']) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escribe el lote pendiente como un grupo de filas."""
+
+        pa = self.pa
+        n_rows = len(self.__columns['cliente'])
+        if n_rows == 0:
+            return
+
+        intervals = pa.ListArray.from_arrays(
+            pa.array(self.__offsets, pa.int32()),
+            pa.StructArray.from_arrays(
+                [pa.array(self.__starts, pa.int64()), pa.array(self.__ends, pa.int64())],
+                fields=[self.interval_type.field(i) for i in range(self.interval_type.num_fields)]
+            )
+        )
+        arrays = [pa.array(self.__columns[name], self.schema.field(name).type) for name in Results_Writer.COLUMNS[:-1]]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays + [intervals], schema=self.schema))
+
+        self.rows += n_rows
+        self.__clear()
+
+    def close(self) -> None:
+        """Escribe el lote pendiente y cierra el archivo."""
+
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self) -> 'Results_Writer':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+class Slice_Tracker:
+    """Sigue a los clientes durante la simulación para registrar los intervalos en que fueron atendidos.
+    Sólo guarda información de los clientes que siguen en la cola."""
+
+    def __init__(self, writer: Results_Writer) -> None:
+        """writer: Destino de los registros de los clientes que terminan."""
+
+        self.writer = writer
+        self.__tickets: dict[logic.Queue_Client, int] = {}
+        self.__intervals: dict[logic.Queue_Client, list[list[int]]] = {}
+
+    def arrive(self, time: int, client: logic.Queue_Client) -> None:
+        """Registra la llegada de un cliente a la cola."""
+
+        self.__tickets[client] = client.get_number_of_requests()
+        self.__intervals[client] = []
+
+    def serve(self, time: int, client: logic.Queue_Client) -> None:
+        """Registra que el cliente fue atendido durante [time, time + 1)."""
+
+        intervals = self.__intervals[client]
+        if intervals and intervals[-1][1] == time:
+            intervals[-1][1] = time + 1
+        else:
+            intervals.append([time, time + 1])
+
+        if client.is_done():
+            self.finish(time + 1, client, 'Terminado')
+
+    def finish(self, time: int, client: logic.Queue_Client, state: str) -> None:
+        """Escribe el registro del cliente y deja de seguirlo.
+        state: Estado final del cliente, por ejemplo 'Terminado' o 'Expulsado'."""
+
+        self.writer.write(
+            client.get_id(), state, client.get_arrival_time(), self.__tickets.pop(client), time,
+            [tuple(interval) for interval in self.__intervals.pop(client)]
+        )
@@ -0,0 +1,103 @@
+"""Programa que simula una cola de cajero sin ventana, para ejecuciones por lotes.
+No importa pygame ni pandas; NumPy sólo se carga si se piden llegadas generadas."""
+
+import argparse, random
+from typing import Iterable
+import logic, params
+
+class Run_Totals:
+    """Totales de una ejecución: clientes terminados, suma de sus tiempos de retorno y tiempo del último que terminó.
+    Sólo guarda a los clientes terminados, en finished, si no se siguió la ejecución con un tracker."""
+
+    def __init__(self, keep_finished: bool) -> None:
+        """keep_finished: Si se guardan los clientes terminados, con el tiempo en que terminaron."""
+
+        self.done = 0
+        self.turnaround = 0
+        self.last_time = 0
+        self.finished: list[tuple[int, logic.Queue_Client]] = [] if keep_finished else None
+
+    def add(self, time: int, client: logic.Queue_Client) -> None:
+        """Cuenta al cliente que terminó en el tiempo indicado."""
+
+        self.done += 1
+        self.turnaround += time - client.get_arrival_time()
+        self.last_time = time
+        if self.finished is not None:
+            self.finished.append((time, client))
+
+    def mean_turnaround(self) -> float:
+        """Devuelve el tiempo de retorno promedio, o 0 si nadie terminó."""
+
+        return self.turnaround / self.done if self.done else 0
+
+def run(queue: logic.FIFO_Server_Queue, clients: Iterable[logic.Queue_Client], tracker=None) -> tuple[int, Run_Totals]:
+    """Agrega los clientes a la cola cuando llega su tiempo y la atiende hasta vaciarla.
+    Devuelve el tiempo final y los totales de los clientes terminados. Con un tracker no se guarda ningún cliente terminado,
+    así que la memoria no crece con la ejecución.
+    queue: Cola a atender.
+    clients: Clientes en orden de llegada.
+    tracker: Objeto con métodos arrive y serve, como export.Slice_Tracker, al que se avisa de cada llegada y atención."""
+
+    pending = iter(clients)
+    next_client = next(pending, None)
+    time = 0
+    done = Run_Totals(tracker is None)
+
+    while next_client is not None or queue.get_size() > 1:
+        while next_client is not None and next_client.get_arrival_time() <= time:
+            queue.enqueue(next_client)
+            if tracker is not None:
+                tracker.arrive(time, next_client)
+            next_client = next(pending, None)
+
+        time += 1
+        if queue.get_size() > 1:
+            served = queue.get(1)
+            out = queue.dequeue()
+            if tracker is not None:
+                tracker.serve(time - 1, served)
+            if out is not None:
+                done.add(time, out)
+
+    return time, done
+
+def main(argv: list[str] = None) -> int:
+    """Ejecuta una simulación según los argumentos de la línea de comandos e imprime un resumen."""
+
+    parser = argparse.ArgumentParser(description='Simulación de una cola de cajero sin ventana.')
+    parser.add_argument('--clients', type=int, default=5, help='Número de clientes.')
+    parser.add_argument('--capacity', type=int, default=params.SERVER_CAPACITY, help='Capacidad del cajero.')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla aleatoria.')
+    parser.add_argument('--arrivals', action='store_true', help='Generar llegadas de Poisson en lugar de que todos lleguen al inicio.')
+    parser.add_argument('--export', default=None, help='Archivo .parquet o .arrow en el que guardar los resultados.')
+    args = parser.parse_args(argv)
+
+    if args.arrivals:
+        import arrivals
+        workload = arrivals.Workload(arrivals.streams(args.seed if args.seed is not None else params.ARRIVAL_SEED, 1)[0])
+        clients = workload.clients(args.clients)
+    else:
+        rng = random.Random(args.seed)
+        clients = [logic.Queue_Client(chr(ord('A') + i) if i < 26 else str(i), rng.randint(1, 15), 0) for i in range(args.clients)]
+
+    if args.export:
+        import export
+        with export.Results_Writer(args.export) as writer:
+            time, done = run(logic.FIFO_Server_Queue(args.capacity), clients, export.Slice_Tracker(writer))
+    else:
+        time, done = run(logic.FIFO_Server_Queue(args.capacity), clients)
+
+    print(f'Clientes atendidos: {done.done}')
+    print(f'Tiempo total: {time}')
+    print(f'Tiempo de retorno promedio: {done.mean_turnaround():.2f}')
+
+    # Con llegadas de Poisson se puede comparar contra el modelo analítico.
+    if args.arrivals:
+        import analytics
+        prediction = analytics.predict(params.ARRIVAL_RATE, None, args.capacity)
+        print(f'Tiempo de retorno según {prediction.model}: {prediction.response:.2f}')
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
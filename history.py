@@ -0,0 +1,222 @@
+"""Módulo con el historial acotado de filas de la tabla de clientes de la simulación de una cola de cajero."""
+
+import collections, csv
+import params
+
+class Rolling_History:
+    """Guarda sólo las últimas filas de la tabla de clientes en un búfer circular.
+    Las filas que salen del búfer se acumulan en contadores globales y por cliente, y opcionalmente se escriben en un CSV,
+    así que la memoria y el costo de dibujar la tabla no crecen durante la simulación y los totales siguen siendo exactos.
+    La última fila de un cliente todavía se puede modificar después de salir del búfer, así que se escribe en el CSV hasta que
+    el cliente tiene una fila nueva, se deja de seguir con release o se llama a close; por eso el CSV no sigue el orden de la tabla.
+    Se puede usar en lugar de un DataFrame en view.Table. Si se escribe un CSV, hay que llamar a close al terminar."""
+
+    def __init__(self, columns: tuple[str, ...], max_rows: int = None, max_ticks: int = None, spill_path: str = None,
+                 summed_columns: tuple[str, ...] = None) -> None:
+        """columns: Nombres de las columnas. La primera es el id del cliente y la segunda su estado.
+        max_rows: Número máximo de filas vivas. Por defecto, params.HISTORY_MAX_ROWS, donde None indica que no hay límite.
+                  Para no tener límite aunque params lo tenga, math.inf.
+        max_ticks: Número de tiempos que una fila permanece viva. Por defecto, params.HISTORY_MAX_TICKS, donde None indica que no hay límite.
+                   Para no tener límite aunque params lo tenga, math.inf.
+        spill_path: Archivo CSV al que se agregan las filas que salen del búfer. Por defecto, params.HISTORY_SPILL_PATH.
+        summed_columns: Columnas numéricas que se suman en los totales de cada cliente. Por defecto, params.HISTORY_SUMMED_COLUMNS.
+        Las que no estén en columns se ignoran."""
+
+        self.columns = tuple(columns)
+        self.max_rows = params.HISTORY_MAX_ROWS if max_rows is None else max_rows
+        self.max_ticks = params.HISTORY_MAX_TICKS if max_ticks is None else max_ticks
+        self.spill_path = params.HISTORY_SPILL_PATH if spill_path is None else spill_path
+        summed_columns = params.HISTORY_SUMMED_COLUMNS if summed_columns is None else summed_columns
+        self.summed_columns = tuple(column for column in summed_columns if column in self.columns)
+
+        self.__positions = {column: i for i, column in enumerate(self.columns)}
+        self.__rows: collections.deque[tuple[int, int, list]] = collections.deque()
+        self.__live: dict[int, list] = {}
+        self.__next_key = 0
+
+        # Última fila de cada cliente, para poder actualizarla aunque ya haya salido del búfer.
+        self.__last_key: dict[str, int] = {}
+        self.__archived_last: dict[int, list] = {}
+
+        self.archived_rows = 0
+        self.archived_states: collections.Counter[str] = collections.Counter()
+        # Por cliente: número de filas archivadas y suma de cada columna de summed_columns, y cuántas hay en cada estado.
+        self.client_totals: dict[str, dict[str, int]] = {}
+        self.client_states: dict[str, collections.Counter[str]] = {}
+
+        # El CSV se abre al sacar la primera fila y queda abierto hasta close.
+        self.__spill_file = None
+        self.__spill_writer = None
+
+    def __getstate__(self) -> dict:
+        """Devuelve el estado sin el archivo abierto, que no se puede guardar con pickle. La copia lo vuelve a abrir al necesitarlo."""
+
+        if self.__spill_file is not None:
+            self.__spill_file.flush()
+
+        state = self.__dict__.copy()
+        state['_Rolling_History__spill_file'] = None
+        state['_Rolling_History__spill_writer'] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def iterrows(self):
+        """Devuelve las filas vivas, de la más vieja a la más nueva, como parejas (llave, valores)."""
+
+        for key, _, row in self.__rows:
+            yield key, row
+
+    def append(self, row: list, time: int = 0) -> int:
+        """Agrega una fila y devuelve su llave. Si se supera el número máximo de filas, saca las más viejas.
+        row: Valores de la fila, en el orden de las columnas.
+        time: Tiempo de la simulación en que se agrega la fila."""
+
+        if len(row) != len(self.columns):
+            raise ValueError
+
+        key = self.__next_key
+        self.__next_key += 1
+        row = list(row)
+
+        client = row[0]
+        previous = self.__last_key.get(client)
+        if previous is not None:
+            self.__spill_archived(previous)
+        self.__last_key[client] = key
+
+        self.__rows.append((key, time, row))
+        self.__live[key] = row
+
+        while self.max_rows is not None and len(self.__rows) > self.max_rows:
+            self.__evict()
+
+        return key
+
+    def trim(self, time: int) -> None:
+        """Saca las filas que llevan más de max_ticks tiempos vivas.
+        time: Tiempo actual de la simulación."""
+
+        if self.max_ticks is None:
+            return
+
+        while self.__rows and self.__rows[0][1] <= time - self.max_ticks:
+            self.__evict()
+
+    def __evict(self) -> None:
+        """Saca la fila más vieja del búfer y la acumula en los contadores."""
+
+        key, _, row = self.__rows.popleft()
+        del self.__live[key]
+
+        client = row[0]
+        self.archived_rows += 1
+        self.archived_states[row[1]] += 1
+
+        totals = self.client_totals.get(client)
+        if totals is None:
+            totals = self.client_totals[client] = dict.fromkeys(('filas',) + self.summed_columns, 0)
+            self.client_states[client] = collections.Counter()
+        totals['filas'] += 1
+        for column in self.summed_columns:
+            totals[column] += row[self.__positions[column]]
+        self.client_states[client][row[1]] += 1
+
+        if self.__last_key.get(client) == key:
+            self.__archived_last[key] = row
+        else:
+            self.__spill(row)
+
+    def __spill(self, row: list) -> None:
+        """Agrega la fila al CSV, si se indicó uno."""
+
+        if self.spill_path:
+            if self.__spill_writer is None:
+                self.__spill_file = open(self.spill_path, 'a', newline='')
+                self.__spill_writer = csv.writer(self.__spill_file)
+            self.__spill_writer.writerow(row)
+
+    def __spill_archived(self, key: int) -> None:
+        """Escribe la última fila archivada con la llave indicada, si la hay, ahora que ya no se va a modificar."""
+
+        row = self.__archived_last.pop(key, None)
+        if row is not None:
+            self.__spill(row)
+
+    def close(self) -> None:
+        """Escribe en el CSV las últimas filas de los clientes que salieron del búfer y lo cierra, si se abrió.
+        Esas filas ya no se pueden modificar. Si después sale otra fila, el CSV se vuelve a abrir."""
+
+        if self.spill_path:
+            for row in self.__archived_last.values():
+                self.__spill(row)
+                del self.__last_key[row[0]]
+            self.__archived_last.clear()
+
+        if self.__spill_file is not None:
+            self.__spill_file.close()
+            self.__spill_file = None
+            self.__spill_writer = None
+
+    def last_key(self, client: str) -> int:
+        """Devuelve la llave de la última fila del cliente indicado o None si no tiene filas."""
+
+        return self.__last_key.get(client)
+
+    def release(self, client: str) -> None:
+        """Deja de seguir la última fila del cliente indicado, por ejemplo cuando ya terminó.
+        La fila sigue en el búfer o en los contadores, pero ya no se puede modificar si salió del búfer."""
+
+        key = self.__last_key.pop(client, None)
+        if key is not None:
+            self.__spill_archived(key)
+
+    def __row(self, key: int) -> list:
+        """Devuelve la fila con la llave indicada, viva o la última de su cliente ya archivada."""
+
+        row = self.__live.get(key)
+        if row is None:
+            row = self.__archived_last.get(key)
+
+        if row is None:
+            raise KeyError(key)
+
+        return row
+
+    def get(self, key: int, column: str):
+        """Devuelve el valor de la columna indicada en la fila indicada."""
+
+        return self.__row(key)[self.__positions[column]]
+
+    def set(self, key: int, column: str, value) -> None:
+        """Cambia el valor de la columna indicada en la fila indicada.
+        Si la fila ya salió del búfer, se corrigen los contadores para que los totales sigan siendo exactos."""
+
+        row = self.__row(key)
+        position = self.__positions[column]
+        if key not in self.__live:
+            if position == 1:
+                self.archived_states[row[1]] -= 1
+                self.archived_states[value] += 1
+                states = self.client_states[row[0]]
+                states[row[1]] -= 1
+                states[value] += 1
+            elif column in self.summed_columns:
+                self.client_totals[row[0]][column] += value - row[position]
+
+        row[position] = value
+
+    def state_totals(self) -> collections.Counter:
+        """Devuelve cuántas filas, vivas o archivadas, hay en cada estado."""
+
+        totals = collections.Counter(self.archived_states)
+        for _, _, row in self.__rows:
+            totals[row[1]] += 1
+
+        return +totals
+
+    def total_rows(self) -> int:
+        """Devuelve el número de filas agregadas desde el inicio."""
+
+        return self.__next_key
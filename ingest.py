@@ -0,0 +1,155 @@
+"""Módulo con un servidor local que recibe solicitudes de boletas en vivo por un socket Unix y las agrega a la cola de cajero.
+
+Cada mensaje es un lote: 4 bytes con la longitud del contenido, en little endian, seguidos de registros de 16 bytes
+con el id del cliente (entero sin signo de 8 bytes), el número de boletas (entero sin signo de 4 bytes)
+y la prioridad (entero con signo de 4 bytes)."""
+
+import asyncio, struct
+from typing import Callable
+import logic, params
+
+HEADER = struct.Struct('<I')
+RECORD = struct.Struct('<QIi')
+
+def encode_batch(records: list[tuple[int, int, int]]) -> bytes:
+    """Devuelve el mensaje con los registros (id del cliente, boletas, prioridad) indicados."""
+
+    payload = b''.join(RECORD.pack(*record) for record in records)
+    return HEADER.pack(len(payload)) + payload
+
+def default_client(id_client: int, tickets: int, priority: int, time: int) -> logic.Queue_Client:
+    """Crea el cliente para un registro recibido. La cola FIFO no usa la prioridad."""
+
+    return logic.Queue_Client(str(id_client), tickets, time)
+
+class Ingest_Protocol(asyncio.BufferedProtocol):
+    """Recibe lotes de registros y los agrega a la cola.
+    Los bytes se reciben directamente en un bytearray reutilizable y se decodifican desde vistas, sin copiarlos.
+    Cada lote se agrega completo en un solo turno del ciclo de eventos, y bajo el candado si se indica uno.
+    Para pruebas se puede usar sin socket llamando a feed."""
+
+    def __init__(self, queue: logic.FIFO_Server_Queue, time_source: Callable[[], int] = None, make_client: Callable = None,
+                 lock=None, on_batch: Callable[[list[logic.Queue_Client]], None] = None, max_batch: int = None) -> None:
+        """queue: Cola a la que se agregan los clientes.
+        time_source: Función que devuelve el tiempo actual de la simulación. Por defecto, siempre 0.
+        make_client: Función (id, boletas, prioridad, tiempo) que crea cada cliente. Por defecto, default_client.
+        lock: Candado a tomar mientras se agrega cada lote, si la cola se usa desde otro hilo.
+        on_batch: Función llamada con los clientes de cada lote después de agregarlos.
+        max_batch: Tamaño máximo del contenido de un lote, en bytes. Por defecto, params.INGEST_MAX_BATCH_BYTES."""
+
+        self.queue = queue
+        self.time_source = time_source
+        self.make_client = default_client if make_client is None else make_client
+        self.lock = lock
+        self.on_batch = on_batch
+        self.max_batch = params.INGEST_MAX_BATCH_BYTES if max_batch is None else max_batch
+
+        self.transport = None
+        self.batches = 0
+        self.records = 0
+        self.errors = 0
+        self.closed = False
+
+        self.__buffer = bytearray(HEADER.size + self.max_batch)
+        self.__view = memoryview(self.__buffer)
+        self.__start = 0
+        self.__end = 0
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Guarda el transporte de la conexión para poder cerrarla ante un lote inválido."""
+
+        self.transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """Devuelve la parte libre del búfer, en la que el socket escribe directamente los bytes recibidos."""
+
+        # Si no queda espacio al final, se mueve el lote incompleto al inicio del búfer.
+        if self.__end == len(self.__buffer):
+            pending = self.__end - self.__start
+            self.__buffer[:pending] = self.__view[self.__start:self.__end]
+            self.__start, self.__end = 0, pending
+
+        return self.__view[self.__end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Procesa los nbytes que el socket acaba de escribir en el búfer."""
+
+        if self.closed:
+            return
+
+        self.__end += nbytes
+        self.__process()
+
+    def feed(self, data: bytes) -> None:
+        """Procesa los bytes indicados como si hubieran llegado por el socket."""
+
+        data = memoryview(data)
+        while data and not self.closed:
+            buffer = self.get_buffer(len(data))
+            size = min(len(buffer), len(data))
+            buffer[:size] = data[:size]
+            self.buffer_updated(size)
+            data = data[size:]
+
+    def __process(self) -> None:
+        """Agrega a la cola todos los lotes completos que hay en el búfer."""
+
+        view = self.__view
+        while self.__end - self.__start >= HEADER.size:
+            (length,) = HEADER.unpack_from(view, self.__start)
+            if length > self.max_batch or length % RECORD.size:
+                self.__error()
+                return
+
+            begin = self.__start + HEADER.size
+            if self.__end - begin < length:
+                break
+
+            self.__enqueue(view[begin:begin + length])
+            self.__start = begin + length
+
+        if self.__start == self.__end:
+            self.__start = self.__end = 0
+
+    def __enqueue(self, payload: memoryview) -> None:
+        """Crea los clientes del lote y los agrega a la cola."""
+
+        time = 0 if self.time_source is None else self.time_source()
+        make_client = self.make_client
+        clients = [make_client(id_client, tickets, priority, time) for id_client, tickets, priority in RECORD.iter_unpack(payload)]
+
+        if self.lock is None:
+            self.__enqueue_all(clients)
+        else:
+            with self.lock:
+                self.__enqueue_all(clients)
+
+        self.batches += 1
+        self.records += len(clients)
+        if self.on_batch is not None:
+            self.on_batch(clients)
+
+    def __enqueue_all(self, clients: list[logic.Queue_Client]) -> None:
+        """Agrega los clientes indicados a la cola, en orden."""
+
+        enqueue = self.queue.enqueue
+        for client in clients:
+            enqueue(client)
+
+    def __error(self) -> None:
+        """Descarta los datos pendientes y cierra la conexión ante un lote inválido."""
+
+        self.errors += 1
+        self.closed = True
+        self.__start = self.__end = 0
+        if self.transport is not None:
+            self.transport.close()
+
+async def serve(path: str, queue: logic.FIFO_Server_Queue, **kwargs) -> asyncio.AbstractServer:
+    """Abre el servidor en el socket Unix indicado y lo devuelve. Cada conexión usa su propio Ingest_Protocol.
+    path: Ruta del socket. Por defecto, params.INGEST_SOCKET_PATH.
+    queue: Cola a la que se agregan los clientes.
+    kwargs: Argumentos para Ingest_Protocol."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.create_unix_server(lambda: Ingest_Protocol(queue, **kwargs), path or params.INGEST_SOCKET_PATH)
@@ -1,10 +1,14 @@
 """Módulo con las estructuras de datos para la simulación de una cola de cajero."""
 
-from typing import TypeVar, Generic
-import random
+from typing import TypeVar, Generic, Iterable, Iterator
+import abc, random, threading, heapq, math
+import params
 
 T = TypeVar('T')
 
+# Tipos de cambio que emite FIFO_Server_Queue, como (tipo, cliente, posición).
+ENQUEUED, MOVED, SERVED, REMOVED = 'enqueued', 'moved', 'served', 'removed'
+
 class Queue(Generic[T]):
     """Representa una cola y sus métodos por defecto siguen el orden de atención PEPS."""
 
@@ -64,6 +68,9 @@ class Queue(Generic[T]):
         """Devuelve el siguiente elemento en la cola al elemento dado si éste está en la cola, de lo contrario devuelve None.
         data: Elemento que precede al elemento buscado."""
 
+        if self.__front is None:
+            return None
+
         aux_node = self.__front
         while True:
             if aux_node.data is data:
@@ -80,6 +87,9 @@ class Queue(Generic[T]):
         """Devuelve la posición del elemento dado o None si el elemento no está en la cola.
         data: Elemento a buscar en la cola."""
 
+        if self.__front is None:
+            return None
+
         i = 0
         aux_node = self.__front
         while True:
@@ -114,9 +124,11 @@ class Queue(Generic[T]):
             self.__back = self.__front
             return
 
+        # Al ser circular, insertar al final es insertar antes del frente, sin recorrer la cola.
         aux_node = self.__front
-        for _ in range(pos):
-            aux_node = aux_node.next
+        if pos + 1 < self.__size:
+            for _ in range(pos):
+                aux_node = aux_node.next
 
         new_node = Queue.__Node(data, aux_node.prev, aux_node)
         aux_node.prev.next = new_node
@@ -147,9 +159,13 @@ class Queue(Generic[T]):
 
             return out
 
-        aux_node = self.__front
-        for _ in range(pos):
-            aux_node = aux_node.next
+        # El último elemento se alcanza directamente desde el final.
+        if pos == self.__size:
+            aux_node = self.__back
+        else:
+            aux_node = self.__front
+            for _ in range(pos):
+                aux_node = aux_node.next
 
         out = aux_node.data
         if aux_node is self.__back:
@@ -178,14 +194,207 @@ class Queue(Generic[T]):
     def __repr__(self) -> str:
         return f'{type(self).__name__}[{T}]({str(list(self))[1:-1]})'
 
+    def __getstate__(self) -> dict:
+        """Devuelve el estado de la cola con sus elementos en una lista plana,
+        para que pickle y copy no recorran los nodos de forma recursiva."""
+
+        state = self.__dict__.copy()
+        for name in ('_Queue__front', '_Queue__back', '_Queue__current'):
+            state.pop(name, None)
+
+        items = []
+        aux_node = self.__front
+        for _ in range(self.__size):
+            items.append(aux_node.data)
+            aux_node = aux_node.next
+
+        state['_Queue__items'] = items
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Reconstruye la cola a partir del estado devuelto por __getstate__."""
+
+        state = state.copy()
+        items = state.pop('_Queue__items')
+        self.__dict__.update(state)
+        self.__front = self.__back = self.__current = None
+
+        prev_node = None
+        for data in items:
+            new_node = Queue.__Node(data, prev_node)
+            if prev_node is None:
+                self.__front = new_node
+            else:
+                prev_node.next = new_node
+            prev_node = new_node
+
+        if prev_node is not None:
+            self.__back = prev_node
+            self.__back.next = self.__front
+            self.__front.prev = self.__back
+
+        self.__size = len(items)
+
+class Concurrent_Queue(Generic[T]):
+    """Representa una cola PEPS segura para usarse desde varios hilos.
+    Usa un candado para el frente y otro para el final, así que agregar y sacar elementos no se bloquean entre sí."""
+
+    class __Node(Generic[T]):
+        """Un nodo en la cola. Contiene información y apunta al siguiente nodo."""
+
+        __slots__ = ('data', 'next')
+
+        def __init__(self, data: T) -> None:
+            self.data = data
+            self.next = None
+
+    def __init__(self, *args: T) -> None:
+        """args: Lista de elementos en la cola."""
+
+        # El frente siempre es un nodo centinela; el primer elemento es el siguiente.
+        self.__head = self.__tail = Concurrent_Queue.__Node(None)
+        self.__head_lock = threading.Lock()
+        self.__tail_lock = threading.Lock()
+        self.__enqueued = 0
+        self.__dequeued = 0
+
+        self.enqueue_many(args)
+
+    def front(self) -> T:
+        """Devuelve el elemento en la primera posición de la cola."""
+
+        first = self.__head.next
+        return None if first is None else first.data
+
+    def back(self) -> T:
+        """Devuelve el elemento en la última posición de la cola."""
+
+        with self.__tail_lock:
+            if self.__tail is self.__head:
+                return None
+
+            return self.__tail.data
+
+    def get(self, pos: int) -> T:
+        """Devuelve el elemento de la cola en la posición indicada."""
+
+        if pos < 0:
+            raise IndexError
+
+        for i, data in enumerate(self):
+            if i == pos:
+                return data
+
+        raise IndexError
+
+    def get_size(self) -> int:
+        """Devuelve número de elementos en la cola. Es exacto sólo si no hay otros hilos modificándola."""
+
+        return self.__enqueued - self.__dequeued
+
+    def index(self, data: T) -> int:
+        """Devuelve la posición del elemento dado o None si el elemento no está en la cola.
+        data: Elemento a buscar en la cola."""
+
+        for i, aux_data in enumerate(self):
+            if aux_data is data:
+                return i
+
+        return None
+
+    def enqueue(self, data: T) -> None:
+        """Agrega al final de la cola el elemento indicado.
+        data: Elemento a agregar a la cola."""
+
+        new_node = Concurrent_Queue.__Node(data)
+        with self.__tail_lock:
+            self.__tail.next = new_node
+            self.__tail = new_node
+            self.__enqueued += 1
+
+    def enqueue_many(self, data: Iterable[T]) -> None:
+        """Agrega al final de la cola los elementos indicados, en orden, tomando el candado una sola vez.
+        data: Elementos a agregar a la cola."""
+
+        # La cadena se arma por fuera del candado para que la sección crítica sea O(1).
+        first = last = None
+        count = 0
+        for aux_data in data:
+            new_node = Concurrent_Queue.__Node(aux_data)
+            if first is None:
+                first = new_node
+            else:
+                last.next = new_node
+            last = new_node
+            count += 1
+
+        if first is None:
+            return
+
+        with self.__tail_lock:
+            self.__tail.next = first
+            self.__tail = last
+            self.__enqueued += count
+
+    def dequeue(self, pos: int = 0) -> T:
+        """Elimina de la cola y devuelve el elemento en la posición indicada.
+        pos: Posición del elemento a eliminar de la cola, 0 por defecto."""
+
+        if pos < 0:
+            raise IndexError
+
+        if pos == 0:
+            with self.__head_lock:
+                first = self.__head.next
+                if first is None:
+                    raise IndexError
+
+                # El primer nodo pasa a ser el centinela.
+                self.__head = first
+                self.__dequeued += 1
+                return first.data
+
+        # Sacar de en medio de la cola toca ambos extremos, así que se toman los dos candados en orden fijo.
+        with self.__head_lock, self.__tail_lock:
+            prev_node = self.__head
+            for _ in range(pos):
+                prev_node = prev_node.next
+                if prev_node is None:
+                    raise IndexError
+
+            aux_node = prev_node.next
+            if aux_node is None:
+                raise IndexError
+
+            prev_node.next = aux_node.next
+            if aux_node is self.__tail:
+                self.__tail = prev_node
+
+            self.__dequeued += 1
+            return aux_node.data
+
+    def __iter__(self) -> Iterator[T]:
+        """Devuelve un iterador independiente. Ve los elementos agregados durante la iteración,
+        pero no bloquea a otros hilos."""
+
+        aux_node = self.__head.next
+        while aux_node is not None:
+            yield aux_node.data
+            aux_node = aux_node.next
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({str(list(self))[1:-1]})'
+
 class Queue_Client:
     """Representa un cliente que espera en una cola de cajero."""
     
-    def __init__(self, id_client: str, n_requests: int, arrival_time: int):
+    def __init__(self, id_client: str, n_requests: int, arrival_time: int, client_class: str = None, deadline: int = None):
         """Crea el cliente con la información correspondiente.
         id_client: Id del cliente.
         n_requests: Número de solicitudes del cliente.
         arrival_time: Momento en el que llega el cliente.
+        client_class: Clase del cliente, por ejemplo socio, público general o revendedor.
+        deadline: Momento límite para terminar de atender al cliente antes de que venza su reserva.
         priority: Prioridad del cliente."""
 
         if n_requests < 0:
@@ -195,17 +404,35 @@ class Queue_Client:
         self.__n_requests = n_requests
         self.__arrival_time = arrival_time
         self.__current_time = arrival_time
+        self.__client_class = client_class
+        self.__deadline = deadline
 
     def get_id(self) -> str:
         """Devuelve el id del cliente."""
 
         return self.__id_client
 
+    def get_client_class(self) -> str:
+        """Devuelve la clase del cliente o None si no tiene."""
+
+        return self.__client_class
+
     def get_number_of_requests(self) -> int:
         """Devuelve el número de solicitudes restantes del cliente."""
 
         return self.__n_requests
 
+    def get_deadline(self) -> int:
+        """Devuelve el momento límite del cliente o None si no tiene."""
+
+        return self.__deadline
+
+    def is_expired(self, time: int) -> bool:
+        """Verdadero si el cliente no ha terminado y su momento límite ya pasó en el tiempo indicado. Falso de lo contrario.
+        time: Tiempo actual."""
+
+        return self.__deadline is not None and not self.is_done() and time >= self.__deadline
+
     def respond_requests(self, quantity: int):
         """Disminuye el número de solicitudes del cliente según el número indicado.
         quantity: Número de solicitudes a atender."""
@@ -238,7 +465,7 @@ class Queue_Client:
         return self.__current_time - self.__arrival_time
 
     def __repr__(self):
-        return f'{type(self).__name__}({self.__id_client}, {self.__n_requests}{"" if self.__priority is None else f", {self.__priority}"})'
+        return f'{type(self).__name__}({self.__id_client}, {self.__n_requests}{"" if self.__deadline is None else f", {self.__deadline}"})'
 
 class FIFO_Server_Queue(Queue[Queue_Client]):
     """Representa una cola donde al frente hay un cajero."""
@@ -262,6 +489,7 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
         self.__capacity = capacity
         self.__quantum = quantum
         self.__current_service = 0
+        self.__changes: list[tuple[str, Queue_Client, int]] = None
 
         for arg in args:
             self.enqueue(arg)
@@ -277,6 +505,8 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
             raise ValueError
         
         super().enqueue(client)
+        if self.__changes is not None:
+            self.__changes.append((ENQUEUED, client, self._Queue__size - 1))
 
     def dequeue(self) -> Queue_Client:
         """Atiende al cliente en la segunda posición de la cola.
@@ -293,9 +523,21 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
         self.__current_service = 0
         
         if self._Queue__front.next.data.is_done():
-            return super().dequeue(1)
+            out = super().dequeue(1)
+            if self.__changes is not None:
+                self.__changes.append((SERVED, out, 1))
+            return out
 
-        self.enqueue(super().dequeue(1))
+        # Al regresar al final de la fila se emite un solo cambio, MOVED, en lugar de ENQUEUED.
+        changes, self.__changes = self.__changes, None
+        try:
+            queue_client = super().dequeue(1)
+            self.enqueue(queue_client)
+        finally:
+            self.__changes = changes
+
+        if self.__changes is not None:
+            self.__changes.append((MOVED, queue_client, self._Queue__size - 1))
         return None
 
     def get_current_service(self) -> int:
@@ -303,6 +545,38 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
 
         return self.__current_service
 
+    def track_changes(self) -> None:
+        """Empieza a guardar los cambios de la fila para pop_changes. Descarta los cambios pendientes."""
+
+        self.__changes = []
+
+    def pop_changes(self) -> list[tuple[str, Queue_Client, int]]:
+        """Devuelve y olvida los cambios de la fila desde la última llamada, en orden, como (tipo, cliente, posición).
+        ENQUEUED: El cliente se agregó en la posición indicada.
+        MOVED: El cliente salió de la posición 1 tras su turno y regresó a la posición indicada.
+        SERVED: El cliente terminó y salió de la posición 1.
+        REMOVED: El cliente salió de la posición indicada sin terminar.
+        Si no se llamó a track_changes, devuelve una lista vacía."""
+
+        if self.__changes is None:
+            return []
+
+        changes, self.__changes = self.__changes, []
+        return changes
+
+    def pop_back(self) -> Queue_Client:
+        """Saca de la cola y devuelve al último cliente en espera, o None si no hay uno que no esté siendo atendido."""
+
+        # El cliente en la posición 1 no se puede sacar si ya empezó a ser atendido.
+        if self._Queue__size <= (1 if self.__current_service == 0 else 2):
+            return None
+
+        position = self._Queue__size - 1
+        out = super().dequeue(position)
+        if self.__changes is not None:
+            self.__changes.append((REMOVED, out, position))
+        return out
+
     def remove(self, queue_client: Queue_Client) -> None:
         """Elimina el cliente indicado de la lista."""
 
@@ -311,10 +585,693 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
             self.__current_service = 0
 
         super().dequeue(index)
+        if self.__changes is not None:
+            self.__changes.append((REMOVED, queue_client, index))
 
     def __repr__(self) -> str:
         return f'{type(self).__name__}({str(list(self))[1:-1]})'
 
+class Scheduled_Server_Queue(FIFO_Server_Queue, metaclass=abc.ABCMeta):
+    """Base para colas con cajero cuyos clientes no forman una sola fila.
+    Las subclases definen get_size, enqueue, dequeue, remove y __iter__, que recorre al cajero y luego a los clientes en orden de atención.
+    Los métodos de FIFO_Server_Queue que dependen de la fila enlazada, como pop_back, no aplican y lanzan TypeError."""
+
+    @abc.abstractmethod
+    def get_size(self) -> int:
+        """Devuelve número de elementos en la cola, contando al cajero."""
+
+    @abc.abstractmethod
+    def enqueue(self, client: Queue_Client) -> None:
+        """Agrega un cliente a la cola.
+        client: Cliente a agregar a la cola."""
+
+    @abc.abstractmethod
+    def dequeue(self) -> Queue_Client:
+        """Atiende al siguiente cliente. Si terminó todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
+
+    @abc.abstractmethod
+    def remove(self, queue_client: Queue_Client) -> None:
+        """Elimina el cliente indicado de la lista."""
+
+    @abc.abstractmethod
+    def __iter__(self):
+        """Recorre al cajero y luego a los clientes en orden de atención."""
+
+    def pop_back(self) -> Queue_Client:
+        """No aplica: los clientes no forman una sola fila."""
+
+        raise TypeError
+
+    def track_changes(self) -> None:
+        """No aplica: las posiciones de los clientes cambian con cada planificación, no sólo con sus propios cambios."""
+
+        raise TypeError
+
+    def pop_changes(self) -> list[tuple[str, Queue_Client, int]]:
+        """No aplica: ver track_changes."""
+
+        raise TypeError
+
+    def back(self) -> Queue_Client:
+        """Devuelve el último elemento según el orden de atención."""
+
+        out = None
+        for out in self:
+            pass
+
+        return out
+
+    def get(self, pos: int) -> Queue_Client:
+        """Devuelve el elemento en la posición indicada según el orden de atención. La posición 0 es el cajero."""
+
+        if not 0 <= pos < self.get_size():
+            raise IndexError
+
+        for i, data in enumerate(self):
+            if i == pos:
+                return data
+
+    def index(self, data: Queue_Client) -> int:
+        """Devuelve la posición del elemento dado según el orden de atención o None si no está en la cola."""
+
+        for i, aux_data in enumerate(self):
+            if aux_data is data:
+                return i
+
+        return None
+
+    def next_value(self, data: Queue_Client) -> Queue_Client:
+        """Devuelve el elemento que sigue al indicado según el orden de atención, o None si no está en la cola."""
+
+        items = list(self)
+        pos = self.index(data)
+        if pos is None:
+            return None
+
+        return items[(pos + 1) % len(items)]
+
+class MLFQ_Server_Queue(Scheduled_Server_Queue):
+    """Representa una cola donde al frente hay un cajero, y los clientes son atendidos según
+    una cola multinivel con retroalimentación: entran al nivel más prioritario, bajan de nivel al agotar
+    su quantum y periódicamente todos vuelven al primer nivel para que nadie espere indefinidamente."""
+
+    def __init__(self, quanta: tuple[int, ...] = None, boost_period: int = None, *args: Queue_Client):
+        """quanta: Quantum de cada nivel, del más prioritario al menos prioritario. Por defecto, params.MLFQ_QUANTA.
+        boost_period: Cada cuántas atenciones todos los clientes vuelven al primer nivel. Si es 0, nunca.
+                      Por defecto, params.MLFQ_BOOST_PERIOD.
+        args: Clientes en la cola."""
+
+        if quanta is None:
+            quanta = params.MLFQ_QUANTA
+
+        if boost_period is None:
+            boost_period = params.MLFQ_BOOST_PERIOD
+
+        if not quanta or any(quantum <= 0 for quantum in quanta) or boost_period < 0:
+            raise ValueError
+
+        super().__init__(0)
+        self.__quanta = tuple(quanta)
+        self.__boost_period = boost_period
+        self.__levels = [Queue() for _ in self.__quanta]
+        self.__occupancy = 0
+        self.__size = 0
+        self.__used: dict[Queue_Client, int] = {}
+        self.__ticks = 0
+
+        for arg in args:
+            self.enqueue(arg)
+
+    def __highest_level(self) -> int:
+        """Devuelve el nivel no vacío más prioritario, o -1 si no hay clientes."""
+
+        # El bit menos significativo encendido corresponde al nivel más prioritario.
+        return (self.__occupancy & -self.__occupancy).bit_length() - 1
+
+    def __push(self, client: Queue_Client, level: int) -> None:
+        """Agrega el cliente al final del nivel indicado."""
+
+        self.__levels[level].enqueue(client)
+        self.__occupancy |= 1 << level
+
+    def __pop(self, level: int, pos: int = 0) -> Queue_Client:
+        """Saca el cliente en la posición indicada del nivel indicado."""
+
+        client = self.__levels[level].dequeue(pos)
+        if self.__levels[level].get_size() == 0:
+            self.__occupancy &= ~(1 << level)
+
+        return client
+
+    def enqueue(self, client: Queue_Client) -> None:
+        """Agrega un cliente al final del nivel más prioritario.
+        client: Cliente a agregar a la cola."""
+
+        if type(client) is not Queue_Client:
+            raise ValueError
+
+        self.__push(client, 0)
+        self.__size += 1
+
+    def dequeue(self) -> Queue_Client:
+        """Atiende al primer cliente del nivel más prioritario.
+        Si el cliente ha terminado todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
+
+        level = self.__highest_level()
+        if level < 0:
+            raise IndexError
+
+        client = self.__levels[level].front()
+        client.respond_requests(1)
+        self.__ticks += 1
+        used = self.__used.get(client, 0) + 1
+
+        if client.is_done():
+            self.__pop(level)
+            self.__used.pop(client, None)
+            self.__size -= 1
+        elif used >= self.__quanta[level]:
+            # Agotó su quantum: baja un nivel, salvo que ya esté en el último.
+            self.__push(self.__pop(level), min(level + 1, len(self.__levels) - 1))
+            self.__used.pop(client, None)
+        else:
+            self.__used[client] = used
+
+        if self.__boost_period and self.__ticks % self.__boost_period == 0:
+            self.boost()
+
+        return client if client.is_done() else None
+
+    def boost(self) -> None:
+        """Devuelve a todos los clientes al primer nivel, conservando su orden."""
+
+        for level in range(1, len(self.__levels)):
+            while self.__levels[level].get_size() > 0:
+                self.__push(self.__pop(level), 0)
+
+        self.__used.clear()
+
+    def get_current_service(self) -> int:
+        """Devuelve el número de servicios que lleva en su quantum el cliente que se atendería ahora."""
+
+        level = self.__highest_level()
+        if level < 0:
+            return 0
+
+        return self.__used.get(self.__levels[level].front(), 0)
+
+    def get_level(self, queue_client: Queue_Client) -> int:
+        """Devuelve el nivel en el que está el cliente indicado o None si no está en la cola."""
+
+        for level, queue in enumerate(self.__levels):
+            if queue.index(queue_client) is not None:
+                return level
+
+        return None
+
+    def remove(self, queue_client: Queue_Client) -> None:
+        """Elimina el cliente indicado de la lista."""
+
+        level = self.get_level(queue_client)
+        if level is None:
+            raise ValueError
+
+        self.__pop(level, self.__levels[level].index(queue_client))
+        self.__used.pop(queue_client, None)
+        self.__size -= 1
+
+    def back(self) -> Queue_Client:
+        """Devuelve el último cliente en ser atendido según los niveles actuales."""
+
+        for queue in reversed(self.__levels):
+            if queue.get_size() > 0:
+                return queue.back()
+
+        return super().front()
+
+    def get_size(self) -> int:
+        """Devuelve número de elementos en la cola, contando al cajero."""
+
+        return self.__size + 1
+
+    def __iter__(self):
+        yield super().front()
+        for queue in self.__levels:
+            yield from queue
+
+class WFQ_Server_Queue(Scheduled_Server_Queue):
+    """Representa una cola donde al frente hay un cajero, y cada clase de cliente tiene su propia fila.
+    El cajero reparte su atención entre las clases según su peso, usando encolamiento justo autosincronizado (SCFQ):
+    cada cliente al frente de su fila recibe un tiempo virtual de terminación y se atiende al de menor tiempo."""
+
+    def __init__(self, weights: dict[str, float] = None, *args: Queue_Client):
+        """weights: Peso de cada clase de cliente. Por defecto, params.WFQ_WEIGHTS.
+        args: Clientes en la cola."""
+
+        if weights is None:
+            weights = params.WFQ_WEIGHTS
+
+        if not weights or any(weight <= 0 for weight in weights.values()):
+            raise ValueError
+
+        super().__init__(0)
+        self.__weights = dict(weights)
+        self.__queues = {client_class: Queue() for client_class in self.__weights}
+        self.__last_finish = {client_class: 0.0 for client_class in self.__weights}
+        self.__virtual_time = 0.0
+
+        # Montículo con una entrada (terminación, orden de llegada, clase) por cada clase con clientes.
+        self.__heap: list[tuple[float, int, str]] = []
+        self.__sequence = 0
+        self.__size = 0
+        self.__used: dict[Queue_Client, int] = {}
+
+        for arg in args:
+            self.enqueue(arg)
+
+    def __class_of(self, client: Queue_Client) -> str:
+        """Devuelve la clase con la que se atiende al cliente indicado."""
+
+        client_class = client.get_client_class()
+        if client_class is None:
+            client_class = params.WFQ_DEFAULT_CLASS
+
+        if client_class not in self.__weights:
+            raise ValueError
+
+        return client_class
+
+    def __activate(self, client_class: str) -> None:
+        """Calcula el tiempo de terminación del cliente al frente de la fila indicada y lo agrega al montículo."""
+
+        head = self.__queues[client_class].front()
+        finish = max(self.__virtual_time, self.__last_finish[client_class]) + head.get_number_of_requests() / self.__weights[client_class]
+        self.__last_finish[client_class] = finish
+        heapq.heappush(self.__heap, (finish, self.__sequence, client_class))
+        self.__sequence += 1
+
+    def enqueue(self, client: Queue_Client) -> None:
+        """Agrega un cliente al final de la fila de su clase.
+        client: Cliente a agregar a la cola."""
+
+        if type(client) is not Queue_Client:
+            raise ValueError
+
+        client_class = self.__class_of(client)
+        queue = self.__queues[client_class]
+        queue.enqueue(client)
+        self.__size += 1
+
+        if queue.get_size() == 1:
+            self.__activate(client_class)
+
+    def dequeue(self) -> Queue_Client:
+        """Atiende al cliente con menor tiempo de terminación hasta que termine.
+        Si el cliente ha terminado todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
+
+        if not self.__heap:
+            raise IndexError
+
+        finish, _, client_class = self.__heap[0]
+        self.__virtual_time = finish
+
+        queue = self.__queues[client_class]
+        client = queue.front()
+        client.respond_requests(1)
+
+        if not client.is_done():
+            self.__used[client] = self.__used.get(client, 0) + 1
+            return None
+
+        heapq.heappop(self.__heap)
+        queue.dequeue()
+        self.__size -= 1
+        self.__used.pop(client, None)
+
+        if queue.get_size() > 0:
+            self.__activate(client_class)
+
+        return client
+
+    def remove(self, queue_client: Queue_Client) -> None:
+        """Elimina el cliente indicado de la lista."""
+
+        client_class = self.__class_of(queue_client)
+        queue = self.__queues[client_class]
+        pos = queue.index(queue_client)
+        if pos is None:
+            raise ValueError
+
+        queue.dequeue(pos)
+        self.__size -= 1
+        self.__used.pop(queue_client, None)
+
+        if pos == 0:
+            self.__heap = [entry for entry in self.__heap if entry[2] != client_class]
+            heapq.heapify(self.__heap)
+            if queue.get_size() > 0:
+                self.__activate(client_class)
+
+    def get_current_service(self) -> int:
+        """Devuelve el número de servicios que se han hecho con el cliente que se atendería ahora."""
+
+        if not self.__heap:
+            return 0
+
+        return self.__used.get(self.__queues[self.__heap[0][2]].front(), 0)
+
+    def get_size(self) -> int:
+        """Devuelve número de elementos en la cola, contando al cajero."""
+
+        return self.__size + 1
+
+    def __iter__(self):
+        yield super().front()
+        for _, _, client_class in sorted(self.__heap):
+            yield from self.__queues[client_class]
+
+class EDF_Server_Queue(Scheduled_Server_Queue):
+    """Representa una cola donde al frente hay un cajero, y siempre se atiende al cliente con el momento límite más cercano.
+    Los clientes sin momento límite se atienden después de todos los que tienen uno.
+    Los clientes vencidos sólo se revisan cuando llegan al frente, así que no hay que recorrer la cola en cada atención."""
+
+    def __init__(self, drop_expired: bool = True, start_time: int = 0, *args: Queue_Client):
+        """drop_expired: Si es verdadero, los clientes vencidos se sacan de la cola sin atenderlos.
+                         Si es falso, se atienden igual y sólo se cuentan como incumplidos.
+        start_time: Tiempo inicial del reloj de la cola.
+        args: Clientes en la cola."""
+
+        super().__init__(0)
+        self.__drop_expired = drop_expired
+        self.__time = start_time
+
+        # Montículo con entradas (momento límite, orden de llegada, cliente).
+        self.__heap: list[tuple[float, int, Queue_Client]] = []
+        self.__sequence = 0
+
+        # Servicios hechos a cada cliente que empezó a ser atendido y no ha terminado.
+        self.__used: dict[Queue_Client, int] = {}
+
+        self.__misses = 0
+        self.__lateness: list[int] = []
+        self.__expired: list[Queue_Client] = []
+
+        for arg in args:
+            self.enqueue(arg)
+
+    def enqueue(self, client: Queue_Client) -> None:
+        """Agrega un cliente a la cola según su momento límite.
+        client: Cliente a agregar a la cola."""
+
+        if type(client) is not Queue_Client:
+            raise ValueError
+
+        deadline = client.get_deadline()
+        heapq.heappush(self.__heap, (math.inf if deadline is None else deadline, self.__sequence, client))
+        self.__sequence += 1
+
+    def dequeue(self) -> Queue_Client:
+        """Atiende al cliente con el momento límite más cercano y avanza el reloj de la cola.
+        Si el cliente ha terminado todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
+
+        if not self.__heap:
+            raise IndexError
+
+        # Los vencidos se descartan al llegar al frente.
+        while self.__drop_expired and self.__heap and self.__heap[0][2].is_expired(self.__time):
+            _, _, client = heapq.heappop(self.__heap)
+            self.__misses += 1
+            self.__expired.append(client)
+            self.__used.pop(client, None)
+
+        self.__time += 1
+        if not self.__heap:
+            return None
+
+        client = self.__heap[0][2]
+        client.respond_requests(1)
+
+        # Un cliente con un límite más cercano puede adelantarse, así que los servicios se cuentan por cliente.
+        if not client.is_done():
+            self.__used[client] = self.__used.get(client, 0) + 1
+            return None
+
+        heapq.heappop(self.__heap)
+        self.__used.pop(client, None)
+
+        deadline = client.get_deadline()
+        if deadline is not None:
+            lateness = self.__time - deadline
+            self.__lateness.append(lateness)
+            if lateness > 0:
+                self.__misses += 1
+
+        return client
+
+    def remove(self, queue_client: Queue_Client) -> None:
+        """Elimina el cliente indicado de la lista."""
+
+        heap = [entry for entry in self.__heap if entry[2] is not queue_client]
+        if len(heap) == len(self.__heap):
+            raise ValueError
+
+        self.__used.pop(queue_client, None)
+        heapq.heapify(heap)
+        self.__heap = heap
+
+    def get_current_service(self) -> int:
+        """Devuelve el número de servicios que se han hecho con el cliente que se atendería ahora."""
+
+        if not self.__heap:
+            return 0
+
+        return self.__used.get(self.__heap[0][2], 0)
+
+    def get_time(self) -> int:
+        """Devuelve el tiempo actual del reloj de la cola."""
+
+        return self.__time
+
+    def set_time(self, time: int) -> None:
+        """Ajusta el reloj de la cola, por ejemplo para seguir al reloj de la simulación.
+        time: Tiempo actual."""
+
+        self.__time = time
+
+    def get_deadline_misses(self) -> int:
+        """Devuelve el número de clientes que terminaron después de su momento límite o vencieron en la cola."""
+
+        return self.__misses
+
+    def get_lateness(self) -> list[int]:
+        """Devuelve el retraso de cada cliente con momento límite que terminó: tiempo final menos momento límite.
+        Un valor negativo indica que terminó antes del límite."""
+
+        return self.__lateness
+
+    def get_lateness_histogram(self, bucket: int = 1) -> dict[int, int]:
+        """Devuelve cuántos clientes terminaron con cada retraso, agrupando los retrasos en intervalos del tamaño indicado.
+        bucket: Tamaño de cada intervalo."""
+
+        histogram = {}
+        for lateness in self.__lateness:
+            key = lateness // bucket * bucket
+            histogram[key] = histogram.get(key, 0) + 1
+
+        return dict(sorted(histogram.items()))
+
+    def get_expired(self) -> list[Queue_Client]:
+        """Devuelve los clientes que se sacaron de la cola por vencer."""
+
+        return self.__expired
+
+    def get_size(self) -> int:
+        """Devuelve número de elementos en la cola, contando al cajero.
+        Puede incluir clientes vencidos que aún no han llegado al frente."""
+
+        return len(self.__heap) + 1
+
+    def __iter__(self):
+        yield super().front()
+        for _, _, client in sorted(self.__heap, key=lambda entry: entry[:2]):
+            yield client
+
+class Bounded_Server_Queue(FIFO_Server_Queue):
+    """Representa una cola donde al frente hay un cajero, pero con un límite de clientes y de espera estimada.
+    Cuando un cliente nuevo no cabe, se aplica una política de rechazo:
+    'reject' rechaza al nuevo, 'drop_oldest' saca al cliente que más lleva esperando,
+    'drop_largest' saca al cliente con más solicitudes y 'early_drop' rechaza al nuevo con una probabilidad
+    que crece con la longitud de la cola antes de llegar al límite."""
+
+    POLICIES = ('reject', 'drop_oldest', 'drop_largest', 'early_drop')
+
+    def __init__(self, capacity: int, max_length: int = None, max_wait: int = None, policy: str = None, seed: int = None, *args: Queue_Client):
+        """capacity: Número de solicitudes que el cajero puede atender por turno.
+                     Si es exactamente 0, se atenderá hasta terminar.
+        max_length: Número máximo de clientes esperando. Por defecto, params.MAX_QUEUE_LENGTH, donde None indica que no hay límite.
+                    Para no tener límite aunque params lo tenga, math.inf.
+        max_wait: Espera estimada máxima, en solicitudes pendientes. Por defecto, params.MAX_ESTIMATED_WAIT, donde None indica que no hay límite.
+                  Para no tener límite aunque params lo tenga, math.inf.
+        policy: Política de rechazo. Por defecto, params.REJECTION_POLICY.
+        seed: Semilla para la política 'early_drop'.
+        args: Clientes en la cola."""
+
+        if policy is None:
+            policy = params.REJECTION_POLICY
+
+        if policy not in Bounded_Server_Queue.POLICIES:
+            raise ValueError
+
+        super().__init__(capacity)
+        self.__max_length = params.MAX_QUEUE_LENGTH if max_length is None else max_length
+        self.__max_wait = params.MAX_ESTIMATED_WAIT if max_wait is None else max_wait
+        self.__policy = policy
+        self.__random = random.Random(seed)
+
+        # Suma de las solicitudes pendientes de todos los clientes en la cola, para estimar la espera en O(1).
+        self.__backlog = 0
+        self.__serving = False
+
+        self.__rejected = 0
+        self.__dropped = 0
+        self.on_reject = None
+
+        for arg in args:
+            self.enqueue(arg)
+
+    def get_length(self) -> int:
+        """Devuelve el número de clientes en la cola, sin contar al cajero."""
+
+        return self.get_size() - 1
+
+    def get_estimated_wait(self) -> int:
+        """Devuelve la espera estimada de un cliente nuevo: el número de solicitudes pendientes en la cola."""
+
+        return self.__backlog
+
+    def get_rejected_count(self) -> int:
+        """Devuelve el número de clientes nuevos que fueron rechazados."""
+
+        return self.__rejected
+
+    def get_dropped_count(self) -> int:
+        """Devuelve el número de clientes que fueron sacados de la cola para dar espacio a otros."""
+
+        return self.__dropped
+
+    def __fits(self, n_requests: int) -> bool:
+        """Verdadero si un cliente con el número de solicitudes indicado cabe en la cola. Falso de lo contrario."""
+
+        if self.__max_length is not None and self.get_length() >= self.__max_length:
+            return False
+
+        if self.__max_wait is not None and self.__backlog + n_requests > self.__max_wait:
+            return False
+
+        return True
+
+    def __early_drop(self) -> bool:
+        """Decide al azar si rechazar a un cliente nuevo según qué tan llena está la cola."""
+
+        if self.__max_length is None:
+            return False
+
+        threshold = params.EARLY_DROP_THRESHOLD * self.__max_length
+        if self.get_length() < threshold:
+            return False
+
+        probability = params.EARLY_DROP_PROBABILITY * (self.get_length() - threshold) / max(1, self.__max_length - threshold)
+        return self.__random.random() < probability
+
+    def __victim(self, client: Queue_Client) -> Queue_Client:
+        """Devuelve el cliente en espera a sacar según la política, o el mismo cliente nuevo si no hay a quién sacar."""
+
+        # El cliente que está siendo atendido no se saca.
+        first = 2 if self.get_current_service() > 0 else 1
+        if self.get_size() <= first:
+            return client
+
+        if self.__policy == 'drop_oldest':
+            return self.get(first)
+
+        victim = client
+        for i, queue_client in enumerate(self):
+            if i >= first and queue_client.get_number_of_requests() > victim.get_number_of_requests():
+                victim = queue_client
+
+        return victim
+
+    def __reject(self, client: Queue_Client, dropped: bool) -> None:
+        """Cuenta el rechazo y avisa a on_reject."""
+
+        if dropped:
+            self.__dropped += 1
+        else:
+            self.__rejected += 1
+
+        if self.on_reject is not None:
+            self.on_reject(client)
+
+    def enqueue(self, client: Queue_Client) -> bool:
+        """Agrega un cliente al final de la cola si la política de rechazo lo permite.
+        Devuelve verdadero si el cliente fue admitido. Falso de lo contrario.
+        client: Cliente a agregar a la cola."""
+
+        if type(client) is not Queue_Client:
+            raise ValueError
+
+        # Los clientes que vuelven a la fila tras su turno ya fueron admitidos.
+        if self.__serving:
+            super().enqueue(client)
+            return True
+
+        n_requests = client.get_number_of_requests()
+        if self.__policy == 'early_drop' and self.__early_drop():
+            self.__reject(client, False)
+            return False
+
+        while not self.__fits(n_requests):
+            if self.__policy in ('reject', 'early_drop'):
+                self.__reject(client, False)
+                return False
+
+            victim = self.__victim(client)
+            if victim is client:
+                self.__reject(client, False)
+                return False
+
+            self.remove(victim)
+            self.__reject(victim, True)
+
+        super().enqueue(client)
+        self.__backlog += n_requests
+        return True
+
+    def dequeue(self) -> Queue_Client:
+        """Atiende al cliente en la segunda posición de la cola.
+        Si el cliente ha terminado todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
+
+        if self.get_size() <= 1:
+            raise IndexError
+
+        queue_client = self.get(1)
+        n_requests = queue_client.get_number_of_requests()
+
+        self.__serving = True
+        try:
+            out = super().dequeue()
+        finally:
+            self.__serving = False
+
+        self.__backlog -= n_requests - queue_client.get_number_of_requests()
+        return out
+
+    def remove(self, queue_client: Queue_Client) -> None:
+        """Elimina el cliente indicado de la lista."""
+
+        super().remove(queue_client)
+        self.__backlog -= queue_client.get_number_of_requests()
+
 # class Priority_Server_Queue(FIFO_Server_Queue):
 #     """Representa una cola donde al frente hay un cajero,
 #     pero los clientes son atendidos según su prioridad más baja."""
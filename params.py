@@ -9,3 +9,53 @@ ENABLE_PRIORITY = True
 TEXTBOX_PADDING = 5
 GRANT_PADDING = 5
 GRANT_TIME_WIDTH = 20
+
+ENABLE_PROFILING = False
+PROFILING_OVERLAY = True
+PROFILING_TRACE_PATH = 'trace.json'
+PROFILING_MAX_EVENTS = 1_000_000
+
+SNAPSHOT_PATH = 'snapshot.bin'
+
+MLFQ_QUANTA = (2, 4, 8)
+MLFQ_BOOST_PERIOD = 50
+
+WFQ_WEIGHTS = {'Socio': 3, 'General': 2, 'Revendedor': 1}
+WFQ_DEFAULT_CLASS = 'General'
+
+MAX_QUEUE_LENGTH = None
+MAX_ESTIMATED_WAIT = None
+REJECTION_POLICY = 'reject'
+EARLY_DROP_THRESHOLD = 0.5
+EARLY_DROP_PROBABILITY = 0.5
+
+DISPATCH_POLICY = 'shortest'
+WORK_STEALING = False
+
+ENABLE_ARRIVALS = False
+ARRIVAL_RATE = 0.1
+ARRIVAL_SEED = 0
+ARRIVAL_BATCH_SIZE = 65536
+
+EXPORT_ROW_GROUP_SIZE = 65536
+
+INGEST_SOCKET_PATH = '/tmp/ticket_queue.sock'
+INGEST_MAX_BATCH_BYTES = 1 << 20
+
+HISTORY_MAX_ROWS = 200
+HISTORY_MAX_TICKS = None
+HISTORY_SPILL_PATH = None
+HISTORY_SUMMED_COLUMNS = ('Boletas',)
+
+ENABLE_SAMPLER = True
+SAMPLER_CAPACITY = 512
+SAMPLER_DOWNSAMPLE = True
+
+HIT_GRID_CELL_SIZE = 64
+
+ANALYTICS_TOLERANCE = 0.1
+ANALYTICS_MAX_RHO = 0.85
+
+CLIENT_IMAGE = 'client.png'
+ATM_IMAGE = 'atm.png'
+LINE_PADDING = 4
@@ -0,0 +1,214 @@
+"""Módulo con herramientas opcionales de perfilado para la simulación de una cola de cajero."""
+
+import json, time
+from typing import Callable, Iterable
+import params
+
+HISTOGRAM_BUCKETS = 48
+
+class Stat:
+    """Acumula el número de llamadas, el tiempo total, el máximo y un histograma de duraciones de una sección."""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, duration: int) -> None:
+        """Registra una duración.
+        duration: Duración en nanosegundos."""
+
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+        # El cubo i contiene las duraciones en [2^(i-1), 2^i) nanosegundos.
+        self.buckets[min(duration.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def mean(self) -> float:
+        """Devuelve la duración promedio en nanosegundos."""
+
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> int:
+        """Devuelve una cota superior, en nanosegundos, del percentil indicado según el histograma.
+        p: Percentil entre 0 y 100."""
+
+        if self.count == 0:
+            return 0
+
+        target = self.count * p / 100
+        accumulated = 0
+        for i, bucket in enumerate(self.buckets):
+            accumulated += bucket
+            if accumulated >= target:
+                return min(1 << i, self.max)
+
+        return self.max
+
+class _Section:
+    """Contexto que mide el tiempo de una sección del programa."""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'Profiler', name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> '_Section':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class _NullSection:
+    """Contexto vacío usado cuando el perfilado está apagado."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSection':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+_NULL_SECTION = _NullSection()
+
+class Profiler:
+    """Mide secciones del programa y métodos de clases, y exporta las mediciones en formato Chrome Trace."""
+
+    def __init__(self, enabled: bool = False, max_events: int = None) -> None:
+        """enabled: Si el perfilado está encendido.
+        max_events: Número máximo de eventos guardados para la traza. Las estadísticas se siguen acumulando al superarlo."""
+
+        self.enabled = enabled
+        self.max_events = params.PROFILING_MAX_EVENTS if max_events is None else max_events
+        self.stats: dict[str, Stat] = {}
+        self.events: list[tuple[str, int, int]] = []
+        self.dropped_events = 0
+        self.origin = time.perf_counter_ns()
+        self.__originals: dict[tuple[type, str], Callable] = {}
+
+    def section(self, name: str):
+        """Devuelve un contexto que mide la sección indicada. Si el perfilado está apagado no mide nada.
+        name: Nombre de la sección."""
+
+        if not self.enabled:
+            return _NULL_SECTION
+
+        return _Section(self, name)
+
+    def record(self, name: str, start: int, end: int) -> None:
+        """Registra una medición.
+        name: Nombre de la sección.
+        start: Inicio en nanosegundos según time.perf_counter_ns.
+        end: Fin en nanosegundos según time.perf_counter_ns."""
+
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = Stat()
+        stat.add(end - start)
+
+        if len(self.events) < self.max_events:
+            self.events.append((name, start, end - start))
+        else:
+            self.dropped_events += 1
+
+    def instrument(self, cls: type, names: Iterable[str] = None) -> None:
+        """Reemplaza los métodos indicados de la clase por versiones que se miden a sí mismas.
+        cls: Clase a instrumentar.
+        names: Nombres de los métodos. Por defecto, todos los métodos públicos de la clase."""
+
+        if names is None:
+            names = [name for name in dir(cls) if not name.startswith('_') and callable(getattr(cls, name))]
+
+        for name in names:
+            if (cls, name) in self.__originals:
+                continue
+
+            method = getattr(cls, name)
+            self.__originals[(cls, name)] = cls.__dict__.get(name)
+            setattr(cls, name, self.__wrap(method, f'{cls.__name__}.{name}'))
+
+    def uninstrument(self) -> None:
+        """Restaura todos los métodos instrumentados."""
+
+        for (cls, name), original in self.__originals.items():
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+
+        self.__originals.clear()
+
+    def __wrap(self, method: Callable, label: str) -> Callable:
+        """Devuelve una función que llama al método indicado y registra su duración."""
+
+        profiler = self
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return method(*args, **kwargs)
+
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.record(label, start, clock())
+
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def reset(self) -> None:
+        """Borra todas las mediciones."""
+
+        self.stats.clear()
+        self.events.clear()
+        self.dropped_events = 0
+        self.origin = time.perf_counter_ns()
+
+    def summary(self, limit: int = None) -> list[str]:
+        """Devuelve líneas de texto con las estadísticas ordenadas por tiempo total.
+        limit: Número máximo de líneas."""
+
+        lines = []
+        ordered = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+        for name, stat in ordered[:limit]:
+            lines.append(
+                f'{name}: n={stat.count} total={stat.total / 1e6:.1f}ms '
+                f'prom={stat.mean() / 1e3:.1f}us p99<={stat.percentile(99) / 1e3:.1f}us max={stat.max / 1e3:.1f}us'
+            )
+
+        return lines
+
+    def export_trace(self, path: str) -> None:
+        """Escribe las mediciones en un archivo JSON compatible con Chrome Trace y speedscope.
+        path: Ruta del archivo."""
+
+        trace_events = [
+            {
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self.origin) / 1e3,
+                'dur': duration / 1e3,
+                'pid': 1,
+                'tid': 1
+            }
+            for name, start, duration in self.events
+        ]
+
+        with open(path, 'w') as file:
+            json.dump({
+                'traceEvents': trace_events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'droppedEvents': self.dropped_events}
+            }, file)
@@ -0,0 +1,152 @@
+"""Módulo para dibujar fuera de pantalla los diagramas y tablas de una simulación terminada y guardarlos como imágenes PNG."""
+
+import os
+
+# Sin ventana: SDL usa el controlador de video vacío si no se indicó otro.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import math, numpy, pygame
+import params, view
+
+NONE, IDLE, CURRENT, BLOCKED = range(4)
+
+def init() -> None:
+    """Inicializa los módulos de pygame necesarios para dibujar sin ventana."""
+
+    if not pygame.get_init():
+        pygame.init()
+
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+def save(surface: pygame.Surface, path: str, size: tuple[int, int] = None) -> None:
+    """Guarda la superficie como PNG, escalándola al tamaño indicado si se pide.
+    surface: Superficie a guardar.
+    path: Ruta del archivo.
+    size: Tamaño final de la imagen (ancho, alto)."""
+
+    if size is not None and tuple(size) != surface.get_size():
+        surface = pygame.transform.smoothscale(surface, size)
+
+    pygame.image.save(surface, path)
+
+def grant_states(grant: view.Grant) -> numpy.ndarray:
+    """Devuelve una matriz (etiquetas, tiempos) con el estado de cada etiqueta en cada tiempo del diagrama:
+    NONE si no estaba activa, IDLE, CURRENT o BLOCKED."""
+
+    ticks = len(grant.current_history)
+    current = numpy.asarray(grant.current_history, dtype=numpy.int64)
+    blocked = numpy.asarray(grant.blocked_history, dtype=numpy.int64)
+    states = numpy.zeros((len(grant.tags), ticks), dtype=numpy.uint8)
+
+    for i, intervals in enumerate(grant.tag_intervals):
+        for start, end in intervals:
+            states[i, start:ticks if end is None else end] = IDLE
+
+        active = states[i] != NONE
+        states[i, active & (blocked == i)] = BLOCKED
+        states[i, active & (current == i)] = CURRENT
+
+    return states
+
+def grant_lines(grant: view.Grant, time_width: int = None) -> pygame.Surface:
+    """Devuelve la superficie con las líneas del diagrama, equivalente a la que arma Grant.add_line.
+    Se pinta un rectángulo por cada tramo en que una etiqueta conserva el mismo estado, sobre un arreglo de NumPy.
+    time_width: Ancho en píxeles de cada tiempo. Por defecto, params.GRANT_TIME_WIDTH."""
+
+    time_width = params.GRANT_TIME_WIDTH if time_width is None else time_width
+    states = grant_states(grant)
+    ticks = states.shape[1]
+
+    pixels = numpy.full((max(1, ticks * time_width), max(1, grant.tags_surface.get_height()), 3), 255, dtype=numpy.uint8)
+    colors = {
+        IDLE: tuple(pygame.Color('Black'))[:3],
+        CURRENT: tuple(pygame.Color('Red'))[:3],
+        BLOCKED: tuple(pygame.Color('Red'))[:3]
+    }
+
+    for i, tag_rect in enumerate(grant.tags_rects):
+        thin = int(tag_rect.height / 5)
+        rows = {
+            IDLE: int(tag_rect.top + tag_rect.height / 2 - thin / 2),
+            CURRENT: tag_rect.top,
+            BLOCKED: int(tag_rect.top + tag_rect.height / 2 - thin / 2)
+        }
+        heights = {IDLE: thin, CURRENT: tag_rect.height, BLOCKED: thin}
+
+        # Límites de los tramos donde cambia el estado.
+        row = states[i]
+        bounds = numpy.flatnonzero(numpy.diff(row)) + 1
+        starts = numpy.concatenate(([0], bounds))
+        ends = numpy.concatenate((bounds, [ticks]))
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            state = int(row[start]) if ticks else NONE
+            if state == NONE:
+                continue
+
+            y = rows[state]
+            pixels[start * time_width:end * time_width, y:y + heights[state]] = colors[state]
+
+    return pygame.surfarray.make_surface(pixels)
+
+def grant_surface(grant: view.Grant, time_width: int = None) -> pygame.Surface:
+    """Devuelve una superficie con el diagrama completo: números de tiempo, etiquetas y líneas.
+    time_width: Ancho en píxeles de cada tiempo. Por defecto, params.GRANT_TIME_WIDTH."""
+
+    time_width = params.GRANT_TIME_WIDTH if time_width is None else time_width
+    lines_surface = grant_lines(grant, time_width)
+    ticks = len(grant.current_history)
+
+    # Se escriben sólo los números que caben sin encimarse.
+    number_height = grant.font.get_height() * 2 // 3
+    label_width = grant.font.size(str(ticks))[0] * 2 // 3 + grant.padding
+    step = max(1, math.ceil(label_width / time_width))
+
+    left = grant.tags_surface.get_width() + grant.padding
+    surface = pygame.Surface((left + lines_surface.get_width(), number_height + max(grant.tags_surface.get_height(), 1)))
+    surface.fill('White')
+
+    for tick in range(0, ticks, step):
+        number_surface = pygame.transform.scale_by(grant.font.render(str(tick + 1), True, 'Black'), 2/3)
+        surface.blit(number_surface, (left + tick * time_width, 0))
+
+    surface.blit(grant.tags_surface, (grant.padding, number_height))
+    surface.blit(lines_surface, (left, number_height))
+    return surface
+
+def table_surface(table: view.Table) -> pygame.Surface:
+    """Devuelve una superficie con la tabla completa, sin importar cuántas filas tenga."""
+
+    n_cols = len(table.df.columns)
+    width = sum(table.col_widths.get(i, table.default_cell_width) - table.outline for i in range(n_cols)) + table.outline
+    height = sum(table.row_heights.get(i, table.default_cell_height) - table.outline for i in range(len(table.df))) + table.default_cell_height
+
+    surface = pygame.Surface((max(1, width), max(1, height)))
+    surface.fill('White')
+
+    pos = table.pos
+    table.pos = pygame.math.Vector2(0, 0)
+    try:
+        table.draw(surface)
+    finally:
+        table.pos = pos
+
+    return surface
+
+def render_grant(grant: view.Grant, path: str, size: tuple[int, int] = None, time_width: int = None) -> None:
+    """Guarda el diagrama completo como PNG.
+    path: Ruta del archivo.
+    size: Tamaño final de la imagen. Por defecto, el tamaño natural del diagrama.
+    time_width: Ancho en píxeles de cada tiempo. Por defecto, params.GRANT_TIME_WIDTH."""
+
+    init()
+    save(grant_surface(grant, time_width), path, size)
+
+def render_table(table: view.Table, path: str, size: tuple[int, int] = None) -> None:
+    """Guarda la tabla completa como PNG.
+    path: Ruta del archivo.
+    size: Tamaño final de la imagen. Por defecto, el tamaño natural de la tabla."""
+
+    init()
+    save(table_surface(table), path, size)
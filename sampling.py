@@ -0,0 +1,108 @@
+"""Módulo para muestrear series de tiempo de la simulación de una cola de cajero en búferes circulares de NumPy."""
+
+import numpy
+import params
+
+class Series_Sampler:
+    """Guarda varias series, con un valor por tiempo, en búferes circulares de tamaño fijo.
+    Los valores se agrupan en cubetas de las que se guardan el mínimo, el máximo y la suma.
+    Si se pide reducir la resolución, al llenarse el búfer se juntan las cubetas de dos en dos y cada cubeta pasa a cubrir el doble de tiempos,
+    así que el búfer siempre cubre la ejecución completa. Si no, se sobreescriben las cubetas más viejas."""
+
+    def __init__(self, names: tuple[str, ...], capacity: int = None, downsample: bool = None) -> None:
+        """names: Nombres de las series.
+        capacity: Número de cubetas del búfer. Por defecto, params.SAMPLER_CAPACITY.
+        downsample: Si se reduce la resolución al llenarse el búfer. Por defecto, params.SAMPLER_DOWNSAMPLE."""
+
+        self.names = tuple(names)
+        self.capacity = params.SAMPLER_CAPACITY if capacity is None else capacity
+        self.downsample = params.SAMPLER_DOWNSAMPLE if downsample is None else downsample
+
+        if self.capacity < 2 or self.downsample and self.capacity % 2:
+            raise ValueError
+
+        self.__indexes = {name: i for i, name in enumerate(self.names)}
+        shape = (len(self.names), self.capacity)
+        self.mins = numpy.zeros(shape)
+        self.maxs = numpy.zeros(shape)
+        self.sums = numpy.zeros(shape)
+
+        # Tiempos por cubeta, posición de la siguiente cubeta y número de cubetas guardadas.
+        self.bucket_size = 1
+        self.head = 0
+        self.count = 0
+
+        # Contadores para que las gráficas sepan qué les falta dibujar.
+        self.ticks = 0
+        self.pushed = 0
+        self.compactions = 0
+
+        self.__pending_min = numpy.zeros(len(self.names))
+        self.__pending_max = numpy.zeros(len(self.names))
+        self.__pending_sum = numpy.zeros(len(self.names))
+        self.__pending = 0
+
+    def record(self, *values: float) -> None:
+        """Agrega el valor de cada serie en el tiempo actual, en el orden de names."""
+
+        if len(values) != len(self.names):
+            raise ValueError
+
+        values = numpy.asarray(values, dtype=float)
+        if self.__pending == 0:
+            self.__pending_min[:] = values
+            self.__pending_max[:] = values
+            self.__pending_sum[:] = values
+        else:
+            numpy.minimum(self.__pending_min, values, out=self.__pending_min)
+            numpy.maximum(self.__pending_max, values, out=self.__pending_max)
+            self.__pending_sum += values
+
+        self.__pending += 1
+        self.ticks += 1
+        if self.__pending == self.bucket_size:
+            self.__push()
+
+    def __push(self) -> None:
+        """Guarda la cubeta pendiente en el búfer."""
+
+        self.mins[:, self.head] = self.__pending_min
+        self.maxs[:, self.head] = self.__pending_max
+        self.sums[:, self.head] = self.__pending_sum
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.pushed += 1
+        self.__pending = 0
+
+        if self.downsample and self.count == self.capacity:
+            self.__compact()
+
+    def __compact(self) -> None:
+        """Junta las cubetas de dos en dos, en la primera mitad del búfer."""
+
+        half = self.capacity // 2
+        for data, reduce in ((self.mins, numpy.min), (self.maxs, numpy.max), (self.sums, numpy.sum)):
+            ordered = numpy.roll(data, -self.head, axis=1).reshape(len(self.names), half, 2)
+            data[:, :half] = reduce(ordered, axis=2)
+
+        self.head = half
+        self.count = half
+        self.bucket_size *= 2
+        self.compactions += 1
+
+    def last(self, name: str, n: int = None) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """Devuelve los mínimos, máximos y promedios de las últimas n cubetas de la serie indicada, de la más vieja a la más nueva.
+        Por defecto, de todas las cubetas guardadas. Los promedios suponen que cada cubeta está completa."""
+
+        n = self.count if n is None else min(n, self.count)
+        row = self.__indexes[name]
+        positions = (self.head - n + numpy.arange(n)) % self.capacity
+        return self.mins[row, positions], self.maxs[row, positions], self.sums[row, positions] / self.bucket_size
+
+    def current(self, name: str) -> float:
+        """Devuelve el último valor máximo guardado de la serie indicada, o 0 si no hay cubetas."""
+
+        if self.count == 0:
+            return 0.0
+
+        return float(self.maxs[self.__indexes[name], self.head - 1])
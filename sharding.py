@@ -0,0 +1,140 @@
+"""Módulo para repartir clientes entre varias colas de cajero independientes, una por ventanilla."""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+import logic, params
+
+class Server_Dispatcher:
+    """Reparte los clientes que llegan entre varias colas de cajero.
+    Las políticas son 'round_robin', 'shortest' (la cola con menos clientes) y 'two_choices'
+    (la más corta entre dos colas elegidas al azar)."""
+
+    POLICIES = ('round_robin', 'shortest', 'two_choices')
+
+    def __init__(self, n_servers: int, capacity: int = None, policy: str = None, steal: bool = None, seed: int = None) -> None:
+        """n_servers: Número de colas.
+        capacity: Capacidad de cada cajero. Por defecto, params.SERVER_CAPACITY.
+        policy: Política de reparto. Por defecto, params.DISPATCH_POLICY.
+        steal: Si un cajero sin clientes toma al último cliente de la cola más larga. Por defecto, params.WORK_STEALING.
+        seed: Semilla para la política 'two_choices'."""
+
+        if policy is None:
+            policy = params.DISPATCH_POLICY
+
+        if n_servers <= 0 or policy not in Server_Dispatcher.POLICIES:
+            raise ValueError
+
+        self.capacity = params.SERVER_CAPACITY if capacity is None else capacity
+        self.queues = [logic.FIFO_Server_Queue(self.capacity) for _ in range(n_servers)]
+        self.policy = policy
+        self.steal = params.WORK_STEALING if steal is None else steal
+        self.time = 0
+
+        # Contadores por cola para decidir en O(1) por cola, sin recorrerlas.
+        self.lengths = [0] * n_servers
+        self.work = [0] * n_servers
+        self.__next = 0
+        self.__random = random.Random(seed)
+
+    def __choose(self) -> int:
+        """Devuelve el índice de la cola a la que va el siguiente cliente."""
+
+        n_servers = len(self.queues)
+        if self.policy == 'round_robin':
+            index = self.__next
+            self.__next = (index + 1) % n_servers
+            return index
+
+        if self.policy == 'two_choices' and n_servers > 1:
+            first, second = self.__random.sample(range(n_servers), 2)
+            return min(first, second, key=lambda i: (self.lengths[i], self.work[i]))
+
+        return min(range(n_servers), key=lambda i: (self.lengths[i], self.work[i]))
+
+    def __push(self, index: int, client: logic.Queue_Client) -> None:
+        """Agrega el cliente a la cola indicada y actualiza sus contadores."""
+
+        self.queues[index].enqueue(client)
+        self.lengths[index] += 1
+        self.work[index] += client.get_number_of_requests()
+
+    def enqueue(self, client: logic.Queue_Client) -> int:
+        """Agrega el cliente a la cola que indique la política y devuelve su índice.
+        client: Cliente a agregar."""
+
+        index = self.__choose()
+        self.__push(index, client)
+        return index
+
+    def get_size(self) -> int:
+        """Devuelve el número total de clientes en todas las colas."""
+
+        return sum(self.lengths)
+
+    def __steal(self, index: int) -> None:
+        """Pasa a la cola indicada el último cliente en espera de la cola más larga."""
+
+        longest = max(range(len(self.queues)), key=self.lengths.__getitem__)
+        if longest == index:
+            return
+
+        client = self.queues[longest].pop_back()
+        if client is None:
+            return
+
+        self.lengths[longest] -= 1
+        self.work[longest] -= client.get_number_of_requests()
+        self.__push(index, client)
+
+    def dequeue(self) -> list[logic.Queue_Client]:
+        """Hace una atención en cada cajero y devuelve los clientes que terminaron."""
+
+        self.time += 1
+        done = []
+        for index, queue in enumerate(self.queues):
+            if self.lengths[index] == 0:
+                if not self.steal:
+                    continue
+
+                self.__steal(index)
+                if self.lengths[index] == 0:
+                    continue
+
+            queue_client = queue.get(1)
+            n_requests = queue_client.get_number_of_requests()
+            out = queue.dequeue()
+            self.work[index] -= n_requests - queue_client.get_number_of_requests()
+
+            if out is not None:
+                self.lengths[index] -= 1
+                done.append(out)
+
+        return done
+
+    def run_parallel(self, processes: int = None) -> list[logic.Queue_Client]:
+        """Atiende cada cola hasta vaciarla en un proceso aparte y devuelve todos los clientes terminados.
+        Las colas son independientes durante la ejecución, así que no se toman clientes entre ellas.
+        processes: Número de procesos. Por defecto, uno por núcleo."""
+
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(_drain, self.queues))
+
+        done = []
+        for index, result in enumerate(results):
+            self.queues[index] = logic.FIFO_Server_Queue(self.capacity)
+            self.lengths[index] = 0
+            self.work[index] = 0
+            done.extend(result)
+
+        return done
+
+def _drain(queue: logic.FIFO_Server_Queue) -> list[logic.Queue_Client]:
+    """Atiende la cola indicada hasta vaciarla y devuelve los clientes en el orden en que terminaron."""
+
+    done = []
+    while queue.get_size() > 1:
+        out = queue.dequeue()
+        if out is not None:
+            done.append(out)
+
+    return done
@@ -0,0 +1,269 @@
+"""Módulo para guardar y restaurar el estado completo de una simulación de cola de cajero."""
+
+import array, collections, functools, gc, io, itertools, operator, pickle, struct
+import logic
+
+MAGIC = b'ATMSNAP1'
+ALIGNMENT = 8
+
+def _without_gc(function):
+    """Decorador que apaga el recolector de ciclos mientras se ejecuta la función.
+    Crear o recorrer millones de objetos lo dispara repetidamente y domina el tiempo total."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            if enabled:
+                gc.enable()
+
+    return wrapper
+
+class _Pickler(pickle.Pickler):
+    """Pickler que reemplaza cada cliente por su índice en una tabla de columnas
+    y guarda los elementos de las colas como un arreglo de índices."""
+
+    def __init__(self, file, buffer_callback) -> None:
+        super().__init__(file, protocol=5, buffer_callback=buffer_callback)
+        self.clients: list[logic.Queue_Client] = []
+        # Queue_Client no define __eq__ ni __hash__, así que los clientes sirven de llave por identidad.
+        # Sólo los primeros indexed clientes de la tabla están en client_index; el resto se agrega al necesitarlo.
+        self.client_index: dict[logic.Queue_Client, int] = {}
+        self.indexed = 0
+        self.queue_index: dict[int, int] = {}
+
+    def index_clients(self) -> None:
+        """Agrega a client_index los clientes de la tabla que todavía no están."""
+
+        if self.indexed < len(self.clients):
+            self.client_index.update(zip(self.clients[self.indexed:], range(self.indexed, len(self.clients))))
+            self.indexed = len(self.clients)
+
+    def add_client(self, client: logic.Queue_Client) -> int:
+        """Devuelve el índice del cliente en la tabla, agregándolo si no está."""
+
+        self.index_clients()
+        index = self.client_index.get(client)
+        if index is None:
+            index = self.client_index[client] = len(self.clients)
+            self.clients.append(client)
+            self.indexed += 1
+
+        return index
+
+    def persistent_id(self, obj):
+        """Devuelve el índice del cliente, la descripción de la cola o None para que pickle guarde el objeto normalmente."""
+
+        if type(obj) is logic.Queue_Client:
+            return self.add_client(obj)
+
+        if not isinstance(obj, logic.Queue):
+            return None
+
+        if id(obj) in self.queue_index:
+            return ('queue_ref', self.queue_index[id(obj)])
+
+        # La cola lleva su propio número, porque al cargar las colas de su estado, como los niveles de MLFQ_Server_Queue,
+        # se reconstruyen antes que ella.
+        number = self.queue_index[id(obj)] = len(self.queue_index)
+
+        state = obj.__getstate__()
+        items = state.pop('_Queue__items')
+
+        # Caso común: un cajero u otro elemento al frente y después clientes distintos que no se han visto.
+        # Se agregan todos juntos al final de la tabla y se guarda sólo el rango, sin revisar cada elemento en Python.
+        first = 1 if items and type(items[0]) is not logic.Queue_Client else 0
+        part = items[first:]
+        if list(map(type, part)).count(logic.Queue_Client) == len(part):
+            self.index_clients()
+            members = set(part)
+            if len(members) == len(part) and members.isdisjoint(self.client_index):
+                start = len(self.clients)
+                self.clients.extend(part)
+                return ('queue_range', number, type(obj), state, items[:first], start, len(part))
+
+        # Los clientes se guardan como índices positivos y cualquier otro elemento como -1 - posición en others.
+        others = []
+        indices = array.array('q', bytes(8 * len(items)))
+        client_type = logic.Queue_Client
+        self.index_clients()
+        client_index = self.client_index
+        clients = self.clients
+        for i, item in enumerate(items):
+            if type(item) is client_type:
+                # Igual que add_client, pero sin el costo de una llamada por elemento.
+                index = client_index.get(item)
+                if index is None:
+                    index = client_index[item] = len(clients)
+                    clients.append(item)
+                indices[i] = index
+            else:
+                indices[i] = -1 - len(others)
+                others.append(item)
+
+        self.indexed = len(clients)
+
+        return ('queue', number, type(obj), state, pickle.PickleBuffer(indices), others)
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickler que reemplaza los índices de la tabla de columnas por los clientes reconstruidos."""
+
+    def __init__(self, file, buffers, clients: list[logic.Queue_Client]) -> None:
+        super().__init__(file, buffers=buffers)
+        self.clients = clients
+        self.queues: dict[int, logic.Queue] = {}
+
+    def persistent_load(self, pid):
+        """Devuelve el cliente o la cola que corresponde a la descripción guardada por _Pickler.persistent_id."""
+
+        if type(pid) is int:
+            return self.clients[pid]
+
+        if pid[0] == 'queue_ref':
+            return self.queues[pid[1]]
+
+        if pid[0] == 'queue_range':
+            _, number, cls, state, head, start, size = pid
+            items = head + self.clients[start:start + size]
+        else:
+            _, number, cls, state, indices, others = pid
+            clients = self.clients
+            items = [clients[i] if i >= 0 else others[-1 - i] for i in indices.cast('q')]
+
+        queue = cls.__new__(cls)
+        queue.__setstate__({**state, '_Queue__items': items})
+        self.queues[number] = queue
+        return queue
+
+def _encode_clients(clients: list[logic.Queue_Client]) -> dict:
+    """Devuelve los atributos de los clientes organizados por columnas.
+    Las columnas de enteros se guardan como arreglos para poder escribirse fuera de banda."""
+
+    names = list(vars(clients[0])) if clients else []
+    columns = []
+    for name in names:
+        values = list(map(operator.attrgetter(name), clients))
+        try:
+            columns.append(pickle.PickleBuffer(array.array('q', values)))
+        except (TypeError, OverflowError):
+            columns.append(values)
+
+    return {'names': names, 'columns': columns}
+
+def _decode_clients(table: dict) -> list[logic.Queue_Client]:
+    """Reconstruye los clientes a partir de la tabla de columnas devuelta por _encode_clients."""
+
+    names = table['names']
+    columns = [column.cast('q') if isinstance(column, memoryview) else column for column in table['columns']]
+    size = len(columns[0]) if columns else 0
+
+    # Se crean los objetos y se asigna cada columna con map para que el ciclo corra en C.
+    clients = list(map(object.__new__, itertools.repeat(logic.Queue_Client, size)))
+    for name, column in zip(names, columns):
+        collections.deque(map(setattr, clients, itertools.repeat(name), column), 0)
+
+    return clients
+
+class Snapshot:
+    """Representa el estado inmutable de una simulación en formato binario.
+    Cada llamada a restore crea una copia independiente, así que una misma foto sirve para bifurcar varias simulaciones."""
+
+    def __init__(self, data: bytes) -> None:
+        """data: Contenido binario de la foto."""
+
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError('No es una foto de simulación.')
+
+        self.data = memoryview(data).toreadonly()
+
+    @classmethod
+    @_without_gc
+    def capture(cls, **state) -> 'Snapshot':
+        """Crea una foto con los objetos indicados por nombre, por ejemplo queue, time, table_data y grant.
+        Los clientes que aparezcan en varios objetos se guardan una sola vez y siguen siendo compartidos al restaurar."""
+
+        main_buffers = []
+        main_file = io.BytesIO()
+        pickler = _Pickler(main_file, main_buffers.append)
+        pickler.dump(state)
+
+        clients_buffers = []
+        clients_data = pickle.dumps(_encode_clients(pickler.clients), protocol=5, buffer_callback=clients_buffers.append)
+
+        # Cada sección: número de búferes, búferes alineados y luego el pickle que los usa.
+        out = io.BytesIO()
+        out.write(MAGIC)
+        for section, buffers in ((clients_data, clients_buffers), (main_file.getbuffer(), main_buffers)):
+            out.write(struct.pack('<Q', len(buffers)))
+            for buffer in buffers:
+                raw = buffer.raw()
+                out.write(struct.pack('<Q', raw.nbytes))
+                out.write(b'\0' * (-out.tell() % ALIGNMENT))
+                out.write(raw)
+
+            out.write(struct.pack('<Q', len(section)))
+            out.write(section)
+
+        return cls(out.getvalue())
+
+    @_without_gc
+    def restore(self) -> dict:
+        """Devuelve un diccionario con copias nuevas de los objetos guardados."""
+
+        data = self.data
+        offset = len(MAGIC)
+        sections = []
+        for writable in (False, True):
+            (n_buffers,) = struct.unpack_from('<Q', data, offset)
+            offset += 8
+
+            # Los búferes de la tabla de clientes se leen sin copiar, como vistas del contenido de la foto.
+            # Los demás, como los arreglos de NumPy del muestreador, se copian para que los objetos restaurados se puedan modificar.
+            buffers = []
+            for _ in range(n_buffers):
+                (size,) = struct.unpack_from('<Q', data, offset)
+                offset += 8
+                offset += -offset % ALIGNMENT
+                buffers.append(memoryview(bytearray(data[offset:offset + size])) if writable else data[offset:offset + size])
+                offset += size
+
+            (size,) = struct.unpack_from('<Q', data, offset)
+            offset += 8
+            sections.append((data[offset:offset + size], buffers))
+            offset += size
+
+        (clients_data, clients_buffers), (main_data, main_buffers) = sections
+        clients = _decode_clients(pickle.loads(clients_data, buffers=clients_buffers))
+        return _Unpickler(io.BytesIO(main_data), main_buffers, clients).load()
+
+    def save(self, path: str) -> None:
+        """Escribe la foto en el archivo indicado.
+        path: Ruta del archivo."""
+
+        with open(path, 'wb') as file:
+            file.write(self.data)
+
+    @classmethod
+    def load(cls, path: str) -> 'Snapshot':
+        """Lee una foto del archivo indicado.
+        path: Ruta del archivo."""
+
+        with open(path, 'rb') as file:
+            return cls(file.read())
+
+def snapshot(path: str, **state) -> Snapshot:
+    """Guarda en el archivo indicado una foto con los objetos indicados y la devuelve.
+    path: Ruta del archivo."""
+
+    out = Snapshot.capture(**state)
+    out.save(path)
+    return out
+
+def restore(path: str) -> dict:
+    """Devuelve un diccionario con los objetos guardados en el archivo indicado.
+    path: Ruta del archivo."""
+
+    return Snapshot.load(path).restore()
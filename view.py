@@ -1,8 +1,13 @@
 """Representaciones gráficas para la simulación gráfica de una cola de cajero."""
 
-import pygame, math, pandas, numpy
+import collections, itertools, os
+import pygame
 import logic, params
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
+
+# pandas sólo se usa para anotar tipos, así que no se importa al cargar el módulo.
+if TYPE_CHECKING:
+    import pandas
 
 class Button:
     """Representa un botón que puede ser oprimido y ejecutar una acción."""
@@ -30,6 +35,7 @@ class Button:
 
         self.active = True
         self.pressed = False
+        self.hover = False
 
         self.outline_color_idle = 'Black'
         self.outline_color_hover = 'Black'
@@ -55,8 +61,20 @@ class Button:
         if self.action is not None:
             self.action()
 
+    def press(self) -> None:
+        """Marca el botón como oprimido y ejecuta su acción."""
+
+        if not self.pressed:
+            self.pressed = True
+            self.performAction()
+
+    def release(self) -> None:
+        """Marca el botón como suelto."""
+
+        self.pressed = False
+
     def update(self):
-        """Ejecuta la lógica del botón."""
+        """Ejecuta la lógica del botón consultando el mouse. No es necesario si el botón está registrado en un HitGrid."""
 
         self.hover = self.rect.collidepoint(pygame.mouse.get_pos())
         if pygame.mouse.get_pressed()[0]:
@@ -188,9 +206,9 @@ class Button:
 #         )
 
 class Table:
-    """Clase contenedora que imprime DataFrames en Pygame."""
+    """Clase contenedora que imprime DataFrames, o cualquier objeto con columns e iterrows como history.Rolling_History, en Pygame."""
 
-    def __init__(self, df: pandas.DataFrame, x: int, y: int, cell_widht: int, cell_height: int, rows: int, cols: int, outline: int, font_name: str = None, font_size: int = None):
+    def __init__(self, df: 'pandas.DataFrame', x: int, y: int, cell_widht: int, cell_height: int, rows: int, cols: int, outline: int, font_name: str = None, font_size: int = None):
         """Construye la tabla con las propiedades indicadas.
         df: El data frame contenido a mostrar.
         x: Posición en x de la esquina superior izquierda de la tabla.
@@ -323,9 +341,36 @@ class Grant:
         self.lines_surface = pygame.Surface((0, 0))
         self.numbers_surface = pygame.Surface((0, 0))
         self.current_time = 1
+        self.font_spec = (font_name, font_size)
+
+        # Historial compacto para volver a dibujar el diagrama completo fuera de pantalla.
+        self.current_history: list[int] = []
+        self.blocked_history: list[int] = []
+        self.tag_intervals: list[list[list[int]]] = []
 
         self.padding = params.GRANT_PADDING
 
+    def __getstate__(self) -> dict:
+        """Devuelve el estado del diagrama con las superficies como bytes, ya que pygame no permite guardarlas directamente."""
+
+        state = self.__dict__.copy()
+        del state['font']
+        for name in ('tags_surface', 'lines_surface', 'numbers_surface'):
+            surface = state[name]
+            state[name] = (surface.get_size(), pygame.image.tobytes(surface, 'RGB'))
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Reconstruye el diagrama a partir del estado devuelto por __getstate__."""
+
+        self.__dict__.update(state)
+        font_name, font_size = self.font_spec
+        self.font = pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+        for name in ('tags_surface', 'lines_surface', 'numbers_surface'):
+            size, data = state[name]
+            setattr(self, name, pygame.image.frombytes(data, size, 'RGB') if size[0] and size[1] else pygame.Surface(size))
+
     def add_tag(self, tag: str) -> None:
         """Añade o regresa una etiqueta al diagrama.
         tag: Etiqueta a agregar."""
@@ -336,11 +381,14 @@ class Grant:
             index = -1
 
         if index >= 0:
+            if not self.tags_active[index]:
+                self.tag_intervals[index].append([len(self.current_history), None])
             self.tags_active[index] = True
             return
 
         self.tags.append(tag)
         self.tags_active.append(True)
+        self.tag_intervals.append([[len(self.current_history), None]])
         tag_surface = self.font.render(tag, True, 'Black')
         tag_rect = tag_surface.get_rect(
             topleft = (
@@ -376,6 +424,8 @@ class Grant:
         tag: Etiqueta para la cual dejar de imprimir líneas."""
 
         index = self.tags.index(tag)
+        if self.tags_active[index]:
+            self.tag_intervals[index][-1][1] = len(self.current_history)
         self.tags_active[index] = False
 
     def add_line(self, current_tag: str = None, blocked_tag: str = None) -> None:
@@ -392,6 +442,9 @@ class Grant:
         else:
             blocked_index = -1
 
+        self.current_history.append(current_index)
+        self.blocked_history.append(blocked_index)
+
         lines_surface = pygame.Surface(
             (
                 self.lines_surface.get_width() + params.GRANT_TIME_WIDTH,
@@ -480,3 +533,385 @@ class Grant:
         )
 
         pygame.draw.rect(surface, 'Black', self.rect, 2)
+
+class Overlay:
+    """Clase que imprime encima de la pantalla las estadísticas de un perfilador."""
+
+    def __init__(self, profiler, x: int, y: int, font_name: str = None, font_size: int = None, lines: int = 8) -> None:
+        """Construye el panel con la información indicada.
+        profiler: Perfilador del cual mostrar estadísticas.
+        x: Posición en x de la esquina superior izquierda del panel.
+        y: Posición en y de la esquina superior izquierda del panel.
+        font_name: Nombre de una fuente en el sistema para el texto del panel.
+        font_size: Tamaño de la fuente para el texto del panel.
+        lines: Número máximo de secciones a mostrar."""
+
+        self.profiler = profiler
+        self.pos = pygame.math.Vector2(x, y)
+        self.font = pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+        self.lines = lines
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Dibuja el panel correspondientemente.
+        surface: Superficie sobre la que se imprimirá el panel."""
+
+        if not self.profiler.enabled:
+            return
+
+        text_surfaces = [self.font.render(line, True, 'White') for line in self.profiler.summary(self.lines)]
+        if not text_surfaces:
+            return
+
+        panel = pygame.Surface(
+            (
+                max(text_surface.get_width() for text_surface in text_surfaces) + 2 * params.TEXTBOX_PADDING,
+                sum(text_surface.get_height() for text_surface in text_surfaces) + 2 * params.TEXTBOX_PADDING
+            ),
+            pygame.SRCALPHA
+        )
+        panel.fill((0, 0, 0, 160))
+
+        y_pos = params.TEXTBOX_PADDING
+        for text_surface in text_surfaces:
+            panel.blit(text_surface, (params.TEXTBOX_PADDING, y_pos))
+            y_pos += text_surface.get_height()
+
+        surface.blit(panel, self.pos)
+
+class Sparkline:
+    """Clase que imprime una serie de un muestreador como una gráfica pequeña, con una columna por cubeta.
+    Cada vez que hay cubetas nuevas se recorre la imagen a la izquierda y sólo se dibujan las columnas nuevas."""
+
+    def __init__(self, sampler, series: str, x: int, y: int, width: int, height: int, high: float = None, color: str = 'Blue', font_name: str = None, font_size: int = None) -> None:
+        """Construye la gráfica con las propiedades indicadas.
+        sampler: Muestreador, como sampling.Series_Sampler, del cual mostrar la serie.
+        series: Nombre de la serie a mostrar.
+        x: Posición en x de la esquina superior izquierda de la gráfica.
+        y: Posición en y de la esquina superior izquierda de la gráfica.
+        width: Ancho de la gráfica, igual al número de cubetas que se muestran.
+        height: Alto de la gráfica.
+        high: Valor que corresponde a la parte superior. Por defecto, se ajusta a los datos.
+        color: Color de las líneas.
+        font_name: Nombre de una fuente en el sistema para el título.
+        font_size: Tamaño de la fuente para el título."""
+
+        self.sampler = sampler
+        self.series = series
+        self.rect = pygame.Rect(x, y, width, height)
+        self.fixed_high = high
+        self.high = 1.0 if high is None else high
+        self.color = color
+        self.font = pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+
+        self.surface = pygame.Surface((width, height))
+        self.surface.fill('White')
+        self.title_surface = self.font.render(series, True, 'Black')
+
+        self.__pushed = 0
+        self.__compactions = sampler.compactions
+
+    def __draw_columns(self, x: int, mins, maxs) -> None:
+        """Dibuja las columnas de las cubetas indicadas a partir de la posición x de la superficie."""
+
+        bottom = self.rect.height - 1
+        scale = bottom / self.high
+        for low, high in zip(mins.tolist(), maxs.tolist()):
+            pygame.draw.line(self.surface, self.color, (x, bottom - int(high * scale)), (x, bottom - int(low * scale)))
+            x += 1
+
+    def __redraw(self) -> None:
+        """Dibuja de nuevo todas las columnas visibles."""
+
+        mins, maxs, _ = self.sampler.last(self.series, self.rect.width)
+        if self.fixed_high is None and len(maxs):
+            self.high = max(self.high, float(maxs.max()))
+
+        self.surface.fill('White')
+        self.__draw_columns(self.rect.width - len(mins), mins, maxs)
+
+    def update(self) -> None:
+        """Dibuja en la superficie de la gráfica las cubetas nuevas del muestreador."""
+
+        new = self.sampler.pushed - self.__pushed
+        if new == 0 and self.sampler.compactions == self.__compactions:
+            return
+
+        mins, maxs, _ = self.sampler.last(self.series, min(new, self.rect.width))
+
+        # Si cambiaron las cubetas guardadas o la escala, se dibuja todo; si no, sólo lo nuevo.
+        if self.sampler.compactions != self.__compactions or new >= self.rect.width:
+            self.__redraw()
+        elif self.fixed_high is None and len(maxs) and maxs.max() > self.high:
+            # La escala crece al doble para que casi nunca haya que dibujar todo.
+            while maxs.max() > self.high:
+                self.high *= 2
+            self.__redraw()
+        else:
+            self.surface.scroll(-new, 0)
+            self.surface.fill('White', pygame.Rect(self.rect.width - new, 0, new, self.rect.height))
+            self.__draw_columns(self.rect.width - new, mins, maxs)
+
+        self.__pushed = self.sampler.pushed
+        self.__compactions = self.sampler.compactions
+        self.title_surface = self.font.render(f'{self.series}: {self.sampler.current(self.series):g}', True, 'Black')
+
+    def reset(self, sampler) -> None:
+        """Dibuja de nuevo toda la gráfica a partir del muestreador indicado, por ejemplo después de restaurar una foto."""
+
+        self.sampler = sampler
+        self.high = 1.0 if self.fixed_high is None else self.fixed_high
+        self.__redraw()
+
+        self.__pushed = sampler.pushed
+        self.__compactions = sampler.compactions
+        self.title_surface = self.font.render(f'{self.series}: {sampler.current(self.series):g}', True, 'Black')
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Dibuja la gráfica correspondientemente.
+        surface: Superficie sobre la que se imprimirá la gráfica."""
+
+        self.update()
+        surface.blit(self.surface, self.rect)
+        surface.blit(self.title_surface, (self.rect.x + 2, self.rect.y))
+        pygame.draw.rect(surface, 'Black', self.rect, 1)
+
+class HitGrid:
+    """Índice espacial de los elementos de la pantalla que reciben eventos del mouse y del teclado.
+    La pantalla se divide en celdas cuadradas y cada elemento se guarda en las celdas que toca su rectángulo,
+    así que cada evento sólo revisa los elementos de una celda y los cuadros sin eventos no revisan ninguno.
+    Los elementos tienen un atributo rect y, opcionalmente, hover, active, press, release y add_text."""
+
+    def __init__(self, cell_size: int = None) -> None:
+        """cell_size: Lado de cada celda en píxeles. Por defecto, params.HIT_GRID_CELL_SIZE."""
+
+        self.cell_size = params.HIT_GRID_CELL_SIZE if cell_size is None else cell_size
+        self.cells: dict[tuple[int, int], list] = {}
+        self.hovered = None
+        self.pressed = None
+        self.focused = None
+
+        self.__cells_of: dict[int, list[tuple[int, int]]] = {}
+
+    def __cells(self, rect: pygame.Rect) -> list[tuple[int, int]]:
+        """Devuelve las celdas que toca el rectángulo indicado."""
+
+        size = self.cell_size
+        return [
+            (cx, cy)
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1)
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)
+        ]
+
+    def register(self, widget) -> None:
+        """Agrega el elemento al índice. Los elementos agregados después quedan encima."""
+
+        if id(widget) in self.__cells_of:
+            raise ValueError
+
+        cells = self.__cells(widget.rect)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(widget)
+
+        self.__cells_of[id(widget)] = cells
+
+    def unregister(self, widget) -> None:
+        """Quita el elemento del índice."""
+
+        for cell in self.__cells_of.pop(id(widget)):
+            widgets = self.cells[cell]
+            widgets.remove(widget)
+            if not widgets:
+                del self.cells[cell]
+
+        if self.hovered is widget:
+            self.__set_hover(None)
+        if self.pressed is widget:
+            self.pressed = None
+        if self.focused is widget:
+            self.focused = None
+
+    def move(self, widget) -> None:
+        """Actualiza el índice después de cambiar el rectángulo del elemento."""
+
+        self.unregister(widget)
+        self.register(widget)
+
+    def widget_at(self, pos: tuple[int, int]):
+        """Devuelve el elemento activo de más arriba en la posición indicada o None si no hay."""
+
+        widgets = self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if widgets is None:
+            return None
+
+        for widget in reversed(widgets):
+            if getattr(widget, 'active', True) and widget.rect.collidepoint(pos):
+                return widget
+
+        return None
+
+    def __set_hover(self, widget) -> None:
+        """Cambia el elemento que está debajo del mouse."""
+
+        if widget is self.hovered:
+            return
+
+        if self.hovered is not None and hasattr(self.hovered, 'hover'):
+            self.hovered.hover = False
+        if widget is not None and hasattr(widget, 'hover'):
+            widget.hover = True
+
+        self.hovered = widget
+
+    def handle(self, event: pygame.event.Event) -> bool:
+        """Actualiza los elementos según el evento indicado. Devuelve verdadero si algún elemento lo usó."""
+
+        if event.type == pygame.MOUSEMOTION:
+            self.__set_hover(self.widget_at(event.pos))
+            return self.hovered is not None
+
+        if event.type == pygame.WINDOWLEAVE:
+            self.__set_hover(None)
+            return False
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
+            widget = self.widget_at(event.pos)
+            self.__set_hover(widget)
+            self.focused = widget if hasattr(widget, 'add_text') else None
+            if widget is not None and hasattr(widget, 'press'):
+                widget.press()
+                self.pressed = widget
+
+            return widget is not None
+
+        if event.type == pygame.MOUSEBUTTONUP and event.button == pygame.BUTTON_LEFT:
+            widget, self.pressed = self.pressed, None
+            if widget is not None and hasattr(widget, 'release'):
+                widget.release()
+
+            return widget is not None
+
+        if event.type == pygame.KEYDOWN and self.focused is not None:
+            self.focused.add_text(event.unicode)
+            return True
+
+        return False
+
+class Line:
+    """Clase que imprime la fila de una FIFO_Server_Queue como el cajero seguido de un dibujo por cliente.
+    La fila se guarda dibujada en una superficie y sólo se modifica con los cambios que emite la cola,
+    recorriendo la parte de la imagen que queda detrás de cada cambio, así que el trabajo por cuadro depende del número de cambios."""
+
+    def __init__(self, queue: logic.FIFO_Server_Queue, x: int, y: int, width: int, height: int, font_name: str = None, font_size: int = None) -> None:
+        """Construye la fila con las propiedades indicadas y empieza a seguir los cambios de la cola.
+        queue: Cola a mostrar.
+        x: Posición en x de la esquina superior izquierda de la fila.
+        y: Posición en y de la esquina superior izquierda de la fila.
+        width: Ancho de la fila. Los clientes que no caben no se dibujan.
+        height: Alto de la fila, incluido el id de cada cliente.
+        font_name: Nombre de una fuente en el sistema para los ids de los clientes.
+        font_size: Tamaño de la fuente para los ids de los clientes."""
+
+        self.rect = pygame.Rect(x, y, width, height)
+        self.font = pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+
+        sprite_height = height - self.font.get_height()
+        self.atm_sprite = Line.load_sprite(params.ATM_IMAGE, sprite_height)
+        self.client_sprite = Line.load_sprite(params.CLIENT_IMAGE, sprite_height)
+        self.slot_width = self.client_sprite.get_width() + params.LINE_PADDING
+
+        self.strip_rect = pygame.Rect(self.atm_sprite.get_width() + params.LINE_PADDING, 0, width - self.atm_sprite.get_width() - params.LINE_PADDING, height)
+        self.visible = max(0, self.strip_rect.width // self.slot_width)
+        self.surface = pygame.Surface((width, height))
+
+        self.reset(queue)
+
+    @staticmethod
+    def load_sprite(path: str, height: int) -> pygame.Surface:
+        """Carga la imagen indicada, relativa a este módulo, y la escala al alto indicado conservando la proporción."""
+
+        image = pygame.image.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), path))
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+
+        return pygame.transform.smoothscale(image, (max(1, image.get_width() * height // image.get_height()), height))
+
+    def reset(self, queue: logic.FIFO_Server_Queue) -> None:
+        """Dibuja de nuevo toda la fila a partir de la cola indicada, por ejemplo después de restaurar una foto.
+        Las colas que no emiten cambios, como las subclases de Scheduled_Server_Queue, lanzan TypeError."""
+
+        queue.track_changes()
+        self.queue = queue
+        self.clients = collections.deque(list(queue)[1:])
+
+        self.surface.fill('White')
+        self.surface.blit(self.atm_sprite, (0, 0))
+        for slot, queue_client in enumerate(itertools.islice(self.clients, self.visible)):
+            self.__draw_client(slot, queue_client)
+
+    def __slot_rect(self, slot: int, slots: int = 1) -> pygame.Rect:
+        """Devuelve el rectángulo de los lugares indicados, a partir de slot, en la superficie de la fila."""
+
+        return pygame.Rect(self.strip_rect.left + slot * self.slot_width, 0, slots * self.slot_width, self.rect.height)
+
+    def __draw_client(self, slot: int, queue_client: logic.Queue_Client) -> None:
+        """Dibuja el cliente indicado en el lugar indicado."""
+
+        rect = self.__slot_rect(slot)
+        self.surface.fill('White', rect)
+        self.surface.blit(self.client_sprite, rect.topleft)
+
+        id_surface = self.font.render(str(queue_client.get_id()), True, 'Black')
+        self.surface.blit(id_surface, (rect.centerx - id_surface.get_width() / 2, self.client_sprite.get_height()))
+
+    def __shift(self, slot: int, direction: int) -> None:
+        """Recorre un lugar, a la izquierda (-1) o a la derecha (1), los clientes dibujados desde el lugar indicado."""
+
+        self.surface.set_clip(self.__slot_rect(slot, self.visible - slot))
+        self.surface.scroll(direction * self.slot_width, 0)
+        self.surface.set_clip(None)
+
+    def __insert(self, slot: int, queue_client: logic.Queue_Client) -> None:
+        """Agrega un cliente en el lugar indicado."""
+
+        self.clients.insert(slot, queue_client)
+        if slot >= self.visible:
+            return
+
+        if slot < len(self.clients) - 1:
+            self.__shift(slot, 1)
+        self.__draw_client(slot, queue_client)
+
+    def __remove(self, slot: int) -> None:
+        """Quita al cliente del lugar indicado."""
+
+        del self.clients[slot]
+        if slot >= self.visible:
+            return
+
+        self.__shift(slot, -1)
+
+        # El último lugar visible queda libre y se llena con el siguiente cliente, si hay.
+        last = self.visible - 1
+        if len(self.clients) > last:
+            self.__draw_client(last, self.clients[last])
+        else:
+            self.surface.fill('White', self.__slot_rect(last))
+
+    def apply(self, changes: list[tuple[str, logic.Queue_Client, int]]) -> None:
+        """Aplica a la fila dibujada los cambios indicados, como los devuelve FIFO_Server_Queue.pop_changes."""
+
+        for kind, queue_client, position in changes:
+            if kind == logic.ENQUEUED:
+                self.__insert(position - 1, queue_client)
+            elif kind == logic.MOVED:
+                self.__remove(0)
+                self.__insert(position - 1, queue_client)
+            else:
+                self.__remove(position - 1)
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Aplica los cambios pendientes de la cola y dibuja la fila correspondientemente.
+        surface: Superficie sobre la que se imprimirá la fila."""
+
+        self.apply(self.queue.pop_changes())
+        surface.blit(self.surface, self.rect)